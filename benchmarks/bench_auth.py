@@ -0,0 +1,96 @@
+# benchmarks/bench_auth.py
+"""Password hashing, login lookups at several table sizes, registration inserts."""
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Iterator
+import itertools
+import os
+import sqlite3
+
+from benchmarks.harness import temp_dir
+from src.database.audit import audit_log
+from src.database.credential_cache import credential_cache
+from src.database.credential_codec import encode_credential
+from src.database.db_handler import configure_connection, create_users_table
+from src.database.repository import SQLiteUserRepository, get_user_repository, set_user_repository
+from src.utils.password import hash_password
+
+LOGIN_TABLE_SIZES = (1_000, 100_000)
+QUICK_LOGIN_TABLE_SIZES = (1_000,)
+PASSWORD = "benchmark-password"
+
+
+@contextmanager
+def isolated_repository(db_path: str) -> Iterator[SQLiteUserRepository]:
+    """Point auth at a scratch database and audit log, restoring the real ones afterwards"""
+    conn = configure_connection(sqlite3.connect(db_path))
+    create_users_table(conn.cursor())
+    conn.commit()
+    conn.close()
+    previous_repo = get_user_repository()
+    previous_audit_path = audit_log.db_path
+    repository = SQLiteUserRepository(db_path)
+    set_user_repository(repository)
+    # login_user records to audit_log; the writer reopens db_path when it restarts
+    audit_log.stop()
+    audit_log.db_path = os.path.join(os.path.dirname(db_path), "audit.db")
+    try:
+        yield repository
+    finally:
+        audit_log.stop()
+        audit_log.db_path = previous_audit_path
+        set_user_repository(previous_repo)
+        credential_cache.clear()
+
+
+def _seed(repository: SQLiteUserRepository, count: int):
+    hashed, salt = hash_password(PASSWORD)
+    row = (encode_credential(hashed), encode_credential(salt))
+    for start in range(0, count, 10_000):
+        repository.bulk_create((f"user{i:07d}", *row) for i in range(start, min(start + 10_000, count)))
+
+
+def benchmarks(quick: bool = False) -> Iterator[tuple]:
+    """Yield (name, setup) pairs; setup is a context manager producing the callable to time"""
+    yield "hash_password", _constant(lambda: hash_password(PASSWORD))
+    salt = os.urandom(16).hex()
+    yield "hash_password_with_salt", _constant(lambda: hash_password(PASSWORD, salt))
+
+    for size in (QUICK_LOGIN_TABLE_SIZES if quick else LOGIN_TABLE_SIZES):
+        yield f"login_lookup_{size}_users_uncached", _login(size, cached=False)
+        yield f"login_lookup_{size}_users_cached", _login(size, cached=True)
+    yield "register_insert", _register()
+
+
+@contextmanager
+def _constant(fn: Callable) -> Iterator[Callable]:
+    yield fn
+
+
+@contextmanager
+def _login(size: int, cached: bool) -> Iterator[Callable]:
+    from src.auth.login import login_user
+    with ExitStack() as stack:
+        tmp = stack.enter_context(temp_dir())
+        repository = stack.enter_context(isolated_repository(os.path.join(tmp, "users.db")))
+        _seed(repository, size)
+        names = itertools.cycle([f"user{i:07d}" for i in range(0, size, max(1, size // 1000))])
+        previous = credential_cache.enabled
+        credential_cache.enabled = cached
+        try:
+            yield lambda: login_user(next(names), PASSWORD)
+        finally:
+            credential_cache.enabled = previous
+
+
+@contextmanager
+def _register() -> Iterator[Callable]:
+    # register_user minus its message boxes: hash, encode, insert
+    with ExitStack() as stack:
+        tmp = stack.enter_context(temp_dir())
+        repository = stack.enter_context(isolated_repository(os.path.join(tmp, "users.db")))
+        counter = itertools.count()
+
+        def register():
+            hashed, salt = hash_password(PASSWORD)
+            repository.create_user(f"new{next(counter):08d}", encode_credential(hashed), encode_credential(salt))
+        yield register
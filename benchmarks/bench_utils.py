@@ -0,0 +1,52 @@
+# benchmarks/bench_utils.py
+"""URL shortening, phone validation/formatting, SMS simulator, fake data, calculator."""
+from contextlib import contextmanager
+from typing import Callable, Iterator
+import itertools
+
+from src.utils.calc_engine import compile_expression, evaluate
+from src.utils.sms_messaging import format_phone_number, send_message, validate_phone_number
+from src.utils.util_shortener import local_short_url
+
+PHONES = ["09171234567", "+639171234567", "917 123 4567", "(0917) 123-4567", "12345"]
+EXPRESSIONS = ["2 + 3 × 4", "sqrt(16) + 2^10", "(1 + 2) * (3 - 4) / 5", "sin(pi / 2) + log(10)"]
+
+
+@contextmanager
+def _constant(fn: Callable) -> Iterator[Callable]:
+    yield fn
+
+
+def _cycled(fn: Callable, values) -> Callable:
+    values = itertools.cycle(values)
+    return lambda: fn(next(values))
+
+
+@contextmanager
+def _fake_data() -> Iterator[Callable]:
+    from src.utils.fake_data_generator import generate_fake_users
+    yield lambda: generate_fake_users(100)
+
+
+@contextmanager
+def _calc_uncached() -> Iterator[Callable]:
+    # Distinct expressions each call, so every one is parsed, validated and compiled
+    counter = itertools.count()
+    yield lambda: compile_expression(f"{next(counter)} * 2 + sqrt(9)")
+
+
+def benchmarks(quick: bool = False) -> Iterator[tuple]:
+    urls = [f"https://example.com/articles/{i}/a-very-long-slug-for-testing" for i in range(100)]
+    yield "shorten_url_local", _constant(_cycled(local_short_url, urls))
+    yield "phone_validate", _constant(_cycled(validate_phone_number, PHONES))
+    yield "phone_format", _constant(_cycled(format_phone_number, PHONES))
+    yield "sms_simulator_send", _constant(lambda: send_message("09171234567", "Benchmark message"))
+    try:
+        import faker  # noqa: F401
+    except ImportError:  # optional for the suite
+        pass
+    else:
+        yield "fake_users_x100", _fake_data()
+    yield "calc_evaluate_cached", _constant(_cycled(evaluate, EXPRESSIONS))
+    yield "calc_compile_uncached", _calc_uncached()
+    yield "calc_evaluate_decimal", _constant(lambda: evaluate("0.1 + 0.2 * 3", "decimal"))
@@ -0,0 +1,85 @@
+# benchmarks/cli_startup.py
+"""
+Cold-start time of the headless CLI.
+
+Runs each cli.py command in a fresh interpreter several times and reports
+the median wall time against COLD_START_BUDGET_MS, and checks that no
+command pulls in tkinter. Commands that need the network, faker or the
+real user database are left out so the numbers are repeatable.
+
+Usage:
+    python -m benchmarks.cli_startup
+    python -m benchmarks.cli_startup --runs 10 --budget 120
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, "cli.py")
+# Median wall time allowed for one command, interpreter start included
+COLD_START_BUDGET_MS = 150.0
+
+COMMANDS = {
+    "interpreter": ["-c", "pass"],
+    "calc": [CLI, "calc", "2^10 + sqrt(16)"],
+    "shorten --offline": [CLI, "shorten", "--offline", "https://example.com/a/long/path"],
+    "sms send": [CLI, "sms", "send", "09171234567", "cold start"],
+}
+
+# Imports the CLI and runs a command in-process, then reports whether tkinter was loaded
+TKINTER_PROBE = (
+    "import runpy, sys\n"
+    "sys.argv = [{cli!r}] + {args!r}\n"
+    "try:\n"
+    "    runpy.run_path({cli!r}, run_name='__main__')\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "sys.stderr.write('tkinter' if 'tkinter' in sys.modules else '')\n"
+)
+
+
+def time_command(args, runs: int) -> float:
+    """Median wall time in ms of `python <args>`"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def loads_tkinter(args) -> bool:
+    probe = TKINTER_PROBE.format(cli=CLI, args=list(args[1:]))
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=False)
+    return result.stderr.endswith("tkinter")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CLI cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget", type=float, default=COLD_START_BUDGET_MS, help="Milliseconds per command")
+    args = parser.parse_args(argv)
+
+    failed = []
+    print(f"  {'command':<20} {'median ms':>10}  tkinter")
+    for name, command in COMMANDS.items():
+        median = time_command(command, args.runs)
+        tk = name != "interpreter" and loads_tkinter(command)
+        print(f"  {name:<20} {median:>10.1f}  {'yes' if tk else 'no'}")
+        if median > args.budget or tk:
+            failed.append(name)
+    if failed:
+        print(f"❌ Over the {args.budget:.0f} ms budget or loads tkinter: {', '.join(failed)}")
+        return 1
+    print(f"✓ All commands within {args.budget:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
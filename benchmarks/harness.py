@@ -0,0 +1,108 @@
+# benchmarks/harness.py
+"""
+Timing, result files and baseline comparison for the benchmark suite.
+
+A benchmark is a zero-argument callable doing one operation. measure()
+auto-ranges the number of calls so each timing run lasts at least
+min_time, repeats that, and keeps the best run (least disturbed by other
+load). Results are reported as operations per second.
+"""
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+MIN_TIME = 0.2
+REPEAT = 3
+# A benchmark regresses if it is this much slower than the baseline
+DEFAULT_TOLERANCE = 0.20
+
+
+def measure(fn: Callable[[], object], min_time: float = MIN_TIME, repeat: int = REPEAT) -> Dict[str, float]:
+    """Best-of-repeat throughput of fn"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return {"ops_per_sec": number / best, "us_per_op": best / number * 1e6, "calls": number}
+
+
+@contextmanager
+def temp_dir(prefix: str = "bench-"):
+    path = tempfile.mkdtemp(prefix=prefix)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": str(os.cpu_count()),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+
+def write_results(results: Dict[str, Dict[str, float]], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Optional[float]]:
+    """
+    Ratio current/baseline throughput per benchmark (None if it has no
+    baseline). Anything below 1 - tolerance is a regression.
+    """
+    ratios = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or not base.get("ops_per_sec"):
+            ratios[name] = None
+        else:
+            ratios[name] = result["ops_per_sec"] / base["ops_per_sec"]
+    return ratios
+
+
+def print_table(results: Dict[str, Dict[str, float]], ratios: Optional[Dict[str, Optional[float]]] = None,
+                tolerance: float = DEFAULT_TOLERANCE, stream=sys.stdout):
+    header = f"  {'benchmark':<36} {'ops/s':>14} {'us/op':>12}"
+    if ratios is not None:
+        header += f" {'vs baseline':>12}"
+    print(header, file=stream)
+    for name, result in results.items():
+        line = f"  {name:<36} {result['ops_per_sec']:>14,.0f} {result['us_per_op']:>12.2f}"
+        if ratios is not None:
+            ratio = ratios.get(name)
+            if ratio is None:
+                line += f" {'new':>12}"
+            else:
+                flag = "  ❌ REGRESSION" if ratio < 1 - tolerance else ""
+                line += f" {ratio:>11.2f}x{flag}"
+        print(line, file=stream)
@@ -0,0 +1,267 @@
+# benchmarks/load_login.py
+"""
+Concurrent login/registration load against a scratch WAL database.
+
+Seeds a users table, then drives --clients concurrent clients (threads,
+spread over --processes worker processes) through login_user and the
+registration insert path with a configurable mix and target rate. Reports
+throughput, p50/p95/p99 latency, 'database is locked' errors and CPU use.
+
+Usage:
+    python -m benchmarks.load_login --clients 50 --duration 10
+    python -m benchmarks.load_login --clients 500 --processes 4 --mix login=0.8,register=0.2 --rate 2000
+    python -m benchmarks.load_login --clients 200 --no-cache --json results.json
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+from benchmarks.harness import temp_dir
+from src.database.audit import audit_log
+from src.database.credential_cache import credential_cache
+from src.database.credential_codec import encode_credential
+from src.database.db_handler import configure_connection, create_users_table
+from src.database.repository import SQLiteUserRepository, UserExistsError, UserRepository, set_user_repository
+from src.utils.password import hash_password
+
+PASSWORD = "load-test-password"
+OPERATIONS = ("login", "register")
+
+
+class CountingRepository(UserRepository):
+    """Wraps a repository to count SQLite lock errors that login_user would otherwise swallow"""
+
+    def __init__(self, inner: UserRepository):
+        self.inner = inner
+        self.locked = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _call(self, method, *args):
+        try:
+            return method(*args)
+        except sqlite3.OperationalError as e:
+            with self._lock:
+                if "locked" in str(e) or "busy" in str(e):
+                    self.locked += 1
+                else:
+                    self.errors += 1
+            raise
+
+    def get_credentials(self, username):
+        return self._call(self.inner.get_credentials, username)
+
+    def create_user(self, username, password_hash, salt):
+        return self._call(self.inner.create_user, username, password_hash, salt)
+
+    def bulk_create(self, rows):
+        return self._call(self.inner.bulk_create, rows)
+
+    def list_users(self, limit=100, after=""):
+        return self._call(self.inner.list_users, limit, after)
+
+
+def seed(db_path: str, users: int):
+    conn = configure_connection(sqlite3.connect(db_path))
+    create_users_table(conn.cursor())
+    hashed, salt = hash_password(PASSWORD)
+    row = (encode_credential(hashed), encode_credential(salt))
+    with conn:
+        conn.executemany(
+            "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)",
+            ((f"user{i:07d}", *row) for i in range(users))
+        )
+    conn.close()
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'login=0.9,register=0.1' -> normalized weights"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation in mix: {name}")
+        mix[name] = float(weight or 1)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Mix weights must add up to more than 0")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def _client(client_id: int, worker_id: int, config: dict, repository: CountingRepository,
+            deadline: float, start_at: float, result: dict):
+    from src.auth.login import login_user
+    # Per-client results, merged after the threads finish
+    latencies = result["latencies"] = {op: [] for op in OPERATIONS}
+    failures = result["failures"] = {op: 0 for op in OPERATIONS}
+    rng = random.Random(f"{worker_id}-{client_id}")
+    names, weights = zip(*config["mix"].items())
+    # Open-loop pacing: each client fires at its own fixed interval, if a rate is set
+    interval = config["clients"] / config["rate"] if config["rate"] else 0.0
+    next_at = start_at + rng.random() * interval
+    sequence = 0
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            return
+        if interval:
+            if next_at > now:
+                time.sleep(min(next_at - now, deadline - now))
+                continue
+            next_at += interval
+        op = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        if op == "login":
+            ok = login_user(f"user{rng.randrange(config['users']):07d}", PASSWORD)
+        else:
+            sequence += 1
+            try:
+                hashed, salt = hash_password(PASSWORD)
+                repository.create_user(f"w{worker_id}c{client_id}n{sequence}",
+                                       encode_credential(hashed), encode_credential(salt))
+                ok = True
+            except (sqlite3.Error, UserExistsError):
+                ok = False
+        latencies[op].append(time.perf_counter() - start)
+        if not ok:
+            failures[op] += 1
+
+
+def run_worker(worker_id: int, clients: int, config: dict) -> dict:
+    """One process: `clients` threads against the shared database file"""
+    repository = CountingRepository(SQLiteUserRepository(config["db_path"]))
+    set_user_repository(repository)
+    audit_log.db_path = config["audit_path"]
+    credential_cache.enabled = config["cache"]
+    client_results = [{} for _ in range(clients)]
+
+    cpu_start = time.process_time()
+    start_at = time.perf_counter()
+    deadline = start_at + config["duration"]
+    threads = [
+        threading.Thread(target=_client, args=(i, worker_id, config, repository, deadline, start_at,
+                                               client_results[i]), daemon=True)
+        for i in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    audit_log.stop()
+    return {
+        "latencies": {op: [v for r in client_results for v in r["latencies"][op]] for op in OPERATIONS},
+        "failures": {op: sum(r["failures"][op] for r in client_results) for op in OPERATIONS},
+        "locked": repository.locked,
+        "db_errors": repository.errors,
+        "cpu_seconds": time.process_time() - cpu_start
+    }
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summarize(results: Iterable[dict], wall: float) -> dict:
+    results = list(results)
+    report = {"wall_seconds": wall, "operations": {}}
+    for op in OPERATIONS:
+        values = sorted(v for r in results for v in r["latencies"][op])
+        if not values:
+            continue
+        report["operations"][op] = {
+            "count": len(values),
+            "throughput": len(values) / wall,
+            "failures": sum(r["failures"][op] for r in results),
+            "p50_ms": _percentile(values, 0.50) * 1000,
+            "p95_ms": _percentile(values, 0.95) * 1000,
+            "p99_ms": _percentile(values, 0.99) * 1000,
+            "max_ms": values[-1] * 1000
+        }
+    report["database_locked"] = sum(r["locked"] for r in results)
+    report["other_db_errors"] = sum(r["db_errors"] for r in results)
+    cpu = sum(r["cpu_seconds"] for r in results)
+    report["cpu_seconds"] = cpu
+    report["cpu_percent_of_machine"] = cpu / wall / (os.cpu_count() or 1) * 100
+    return report
+
+
+def run_load(clients: int = 50, processes: int = 1, duration: float = 10.0, users: int = 10000,
+             mix: Optional[Dict[str, float]] = None, rate: float = 0.0, cache: bool = True) -> dict:
+    with temp_dir("load-login-") as tmp:
+        db_path = os.path.join(tmp, "users.db")
+        seed(db_path, users)
+        config = {
+            "db_path": db_path,
+            "audit_path": os.path.join(tmp, "audit.db"),
+            "users": users,
+            "mix": mix or {"login": 0.9, "register": 0.1},
+            "rate": rate,
+            "clients": clients,
+            "duration": duration,
+            "cache": cache
+        }
+        # Spread clients as evenly as possible over the worker processes
+        shares: List[Tuple[int, int]] = [
+            (w, clients // processes + (1 if w < clients % processes else 0)) for w in range(processes)
+        ]
+        start = time.perf_counter()
+        if processes == 1:
+            results = [run_worker(0, clients, config)]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [pool.submit(run_worker, w, n, config) for w, n in shares if n]
+                results = [f.result() for f in futures]
+        return summarize(results, time.perf_counter() - start)
+
+
+def print_report(report: dict):
+    print(f"  {'op':<10} {'count':>8} {'ops/s':>10} {'fail':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for op, r in report["operations"].items():
+        print(f"  {op:<10} {r['count']:>8} {r['throughput']:>10,.0f} {r['failures']:>6} "
+              f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['max_ms']:>9.2f}")
+    print(f"  database is locked: {report['database_locked']}   other DB errors: {report['other_db_errors']}")
+    print(f"  CPU: {report['cpu_seconds']:.1f}s over {report['wall_seconds']:.1f}s wall "
+          f"({report['cpu_percent_of_machine']:.0f}% of {os.cpu_count()} CPUs)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent login/registration load test")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes the clients are spread over")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument("--users", type=int, default=10000, help="Users seeded before the run")
+    parser.add_argument("--mix", default="login=0.9,register=0.1")
+    parser.add_argument("--rate", type=float, default=0.0, help="Target total ops/s (0 = as fast as possible)")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the credential cache (every login hits SQLite)")
+    parser.add_argument("--json", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.clients < 1 or args.processes < 1:
+        parser.error("--clients and --processes must be at least 1")
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"Load: {args.clients} clients / {args.processes} process(es), {args.duration:.0f}s, "
+          f"{args.users:,} users, mix {args.mix}, rate {args.rate or 'unlimited'}")
+    report = run_load(args.clients, args.processes, args.duration, args.users, mix, args.rate, not args.no_cache)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# benchmarks/run.py
+"""
+Run the benchmark suite headless, write JSON results and compare them with
+a stored baseline.
+
+Usage:
+    python -m benchmarks.run                          # full suite, compare with benchmarks/baseline.json
+    python -m benchmarks.run --quick --only auth      # smaller tables, one group
+    python -m benchmarks.run --save-baseline          # record this machine's baseline
+    python -m benchmarks.run --output results.json --tolerance 0.1
+
+Exits with status 1 if any benchmark is slower than the baseline by more
+than the tolerance.
+"""
+import argparse
+import fnmatch
+import os
+import sys
+
+from benchmarks import bench_auth, bench_utils
+from benchmarks.harness import (
+    DEFAULT_TOLERANCE, MIN_TIME, compare, load_results, measure, print_table, write_results
+)
+
+GROUPS = {"auth": bench_auth, "utils": bench_utils}
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def run(groups, quick: bool = False, pattern: str = "*", min_time: float = MIN_TIME):
+    results = {}
+    for group in groups:
+        for name, setup in GROUPS[group].benchmarks(quick):
+            name = f"{group}.{name}"
+            if not fnmatch.fnmatch(name, pattern):
+                continue
+            print(f"  running {name}...", file=sys.stderr)
+            with setup as fn:
+                results[name] = measure(fn, min_time)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Secure Utilities benchmark suite")
+    parser.add_argument("--only", choices=sorted(GROUPS), action="append", help="Run only these groups")
+    parser.add_argument("--filter", default="*", help="Glob on benchmark names, e.g. 'auth.login*'")
+    parser.add_argument("--quick", action="store_true", help="Smaller data sets and shorter timings")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before flagging a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.only or sorted(GROUPS), args.quick, args.filter,
+                  MIN_TIME / 4 if args.quick else MIN_TIME)
+    if args.output:
+        write_results(results, args.output)
+
+    if args.save_baseline:
+        write_results(results, args.baseline)
+        print_table(results)
+        print(f"✓ Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print_table(results)
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    ratios = compare(results, load_results(args.baseline), args.tolerance)
+    print_table(results, ratios, args.tolerance)
+    regressions = [name for name, ratio in ratios.items() if ratio is not None and ratio < 1 - args.tolerance]
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    print("✓ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
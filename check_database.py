@@ -1,6 +1,9 @@
+import argparse
+import csv
+import json
 import sqlite3
 import os
-from tabulate import tabulate
+import sys
 
 # Database path
 DB_PATH = os.path.join(
@@ -8,90 +11,250 @@ DB_PATH = os.path.join(
     "src", "database", "users.db"
 )
 
-def check_database():
+# Rows fetched per keyset page - memory use is bounded by this, not table size
+PAGE_SIZE = 500
+
+
+def connect_readonly(path):
+    """Open the database read-only so inspecting never creates or locks it for writes"""
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def list_tables(cursor, only=None):
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name;"
+    )
+    tables = [row[0] for row in cursor.fetchall()]
+    if only:
+        tables = [t for t in tables if t in only]
+    return tables
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def iter_pages(conn, table, where=None, limit=None, page_size=PAGE_SIZE):
+    """
+    Yield lists of rows using keyset pagination on rowid, so each page is an
+    index seek instead of an OFFSET scan. Falls back to plain cursor streaming
+    for WITHOUT ROWID tables.
+    """
+    condition = f" AND ({where})" if where else ""
+    remaining = limit
+    last_rowid = None
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(f"SELECT rowid FROM {quote(table)} LIMIT 0;")
+        has_rowid = True
+    except sqlite3.OperationalError:
+        has_rowid = False
+
+    if not has_rowid:
+        cursor.execute(f"SELECT * FROM {quote(table)}" + (f" WHERE {where}" if where else "") + ";")
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            rows = cursor.fetchmany(size)
+            if not rows:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            yield rows
+        return
+
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        if last_rowid is None:
+            cursor.execute(
+                f"SELECT rowid, * FROM {quote(table)} WHERE 1{condition} ORDER BY rowid LIMIT ?;",
+                (size,)
+            )
+        else:
+            cursor.execute(
+                f"SELECT rowid, * FROM {quote(table)} WHERE rowid > ?{condition} ORDER BY rowid LIMIT ?;",
+                (last_rowid, size)
+            )
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        last_rowid = rows[-1][0]
+        if remaining is not None:
+            remaining -= len(rows)
+        yield [row[1:] for row in rows]
+
+
+def jsonable(value):
+    return value.hex() if isinstance(value, (bytes, bytearray, memoryview)) else value
+
+
+def preview(value):
+    text = value.hex() if isinstance(value, (bytes, bytearray, memoryview)) else str(value)
+    return text[:16] + "..." if len(text) > 16 else text
+
+
+def table_stats(cursor, table):
+    """Page count and size for a table or index from dbstat, if compiled in"""
+    try:
+        cursor.execute("SELECT COUNT(*), COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name = ?;", (table,))
+        return cursor.fetchone()
+    except sqlite3.OperationalError:
+        return None
+
+
+def print_summary(conn, tables):
+    """COUNT(*), page usage and index info per table - no row data is read"""
+    from tabulate import tabulate
+    cursor = conn.cursor()
+
+    page_size = cursor.execute("PRAGMA page_size;").fetchone()[0]
+    page_count = cursor.execute("PRAGMA page_count;").fetchone()[0]
+    freelist = cursor.execute("PRAGMA freelist_count;").fetchone()[0]
+    print(f"Page size: {page_size} bytes • Pages: {page_count} • Free pages: {freelist}")
+    print(f"File size: {page_size * page_count / 1024:.1f} KiB")
+
+    rows = []
+    for table in tables:
+        count = cursor.execute(f"SELECT COUNT(*) FROM {quote(table)};").fetchone()[0]
+        stats = table_stats(cursor, table)
+        pages, size = stats if stats else ("n/a", "n/a")
+        rows.append([table, count, pages, size])
+    print("\nTables:")
+    print(tabulate(rows, headers=["Table", "Rows", "Pages", "Bytes"], tablefmt="grid"))
+
+    index_rows = []
+    for table in tables:
+        for _, index_name, unique, origin, _ in cursor.execute(f"PRAGMA index_list({quote(table)});").fetchall():
+            columns = [col[2] for col in cursor.execute(f"PRAGMA index_info({quote(index_name)});").fetchall()]
+            stats = table_stats(cursor, index_name)
+            pages = stats[0] if stats else "n/a"
+            index_rows.append([table, index_name, ", ".join(columns), "yes" if unique else "no", origin, pages])
+    print("\nIndexes:")
+    if index_rows:
+        print(tabulate(index_rows, headers=["Table", "Index", "Columns", "Unique", "Origin", "Pages"], tablefmt="grid"))
+    else:
+        print("  (none)")
+
+
+def print_table(conn, table, args):
+    """Stream one table's rows in the requested format"""
+    cursor = conn.cursor()
+    columns = cursor.execute(f"PRAGMA table_info({quote(table)});").fetchall()
+    col_names = [col[1] for col in columns]
+
+    if args.format == "json":
+        for page in iter_pages(conn, table, args.where, args.limit, args.page_size):
+            for row in page:
+                record = {"table": table}
+                record.update({name: jsonable(value) for name, value in zip(col_names, row)})
+                sys.stdout.write(json.dumps(record) + "\n")
+        return
+
+    if args.format == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(col_names)
+        for page in iter_pages(conn, table, args.where, args.limit, args.page_size):
+            writer.writerows([jsonable(value) for value in row] for row in page)
+        return
+
+    from tabulate import tabulate
+    print(f"\n📋 TABLE: {table}")
+    print("-" * 80)
+    print("\nTable Structure:")
+    col_headers = ["ID", "Column Name", "Type", "Not Null", "Default", "PK"]
+    print(tabulate(columns, headers=col_headers, tablefmt="grid"))
+
+    shown = 0
+    for number, page in enumerate(iter_pages(conn, table, args.where, args.limit, args.page_size), 1):
+        print(f"\nTable Data (page {number}):")
+        print(tabulate(page, headers=col_names, tablefmt="grid"))
+        shown += len(page)
+
+        # Show password security info
+        if table == "users" and {"username", "password_hash", "salt"} <= set(col_names):
+            user_i, hash_i, salt_i = (col_names.index(c) for c in ("username", "password_hash", "salt"))
+            print("\n🔐 Security Info:")
+            for row in page:
+                print(f"  User: {row[user_i]}")
+                print(f"    Password Hash: {preview(row[hash_i])}")
+                print(f"    Salt: {preview(row[salt_i])}")
+                print()
+
+    if shown:
+        print(f"\nRecords shown: {shown}")
+    else:
+        print("\n⚠️  No records found in this table")
+
+
+def check_database(args=None):
     """Check and display database contents"""
+    args = args or parse_args([])
+    machine = args.format in ("json", "csv") and not args.summary
+
+    # Check if database exists before connecting (connecting would create it)
+    if not os.path.exists(args.db):
+        print(f"❌ Database file not found: {args.db}")
+        return
+
     try:
-        # Connect to database
-        conn = sqlite3.connect(DB_PATH)
+        conn = connect_readonly(args.db)
         cursor = conn.cursor()
-        
-        print("=" * 80)
-        print("DATABASE INSPECTION TOOL")
-        print("=" * 80)
-        print(f"Database Location: {DB_PATH}")
-        print()
-        
-        # Check if database exists
-        if not os.path.exists(DB_PATH):
-            print("❌ Database file not found!")
-            return
-        
-        print("✓ Database file found")
-        print()
-        
-        # Get all tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        
-        print(f"Tables in database: {len(tables)}")
-        print("-" * 80)
-        
-        for table in tables:
-            table_name = table[0]
-            print(f"\n📋 TABLE: {table_name}")
-            print("-" * 80)
-            
-            # Get table structure
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = cursor.fetchall()
-            
-            print("\nTable Structure:")
-            col_headers = ["ID", "Column Name", "Type", "Not Null", "Default", "PK"]
-            print(tabulate(columns, headers=col_headers, tablefmt="grid"))
-            
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-            count = cursor.fetchone()[0]
-            print(f"\nTotal Records: {count}")
-            
-            # Display data
-            if count > 0:
-                cursor.execute(f"SELECT * FROM {table_name};")
-                rows = cursor.fetchall()
-                
-                # Get column names
-                cursor.execute(f"PRAGMA table_info({table_name});")
-                col_info = cursor.fetchall()
-                col_names = [col[1] for col in col_info]
-                
-                print("\nTable Data:")
-                print(tabulate(rows, headers=col_names, tablefmt="grid"))
-                
-                # Show password security info
-                if table_name == "users":
-                    print("\n🔐 Security Info:")
-                    for row in rows:
-                        username = row[1]
-                        hash_preview = row[2][:16] + "..." if len(row[2]) > 16 else row[2]
-                        salt_preview = row[3][:16] + "..." if len(row[3]) > 16 else row[3]
-                        print(f"  User: {username}")
-                        print(f"    Password Hash: {hash_preview}")
-                        print(f"    Salt: {salt_preview}")
-                        print(f"    ✓ Password is encrypted (SHA-256)")
-                        print()
-            else:
-                print("\n⚠️  No records found in this table")
-        
-        print("\n" + "=" * 80)
-        print("DATABASE INSPECTION COMPLETE")
-        print("=" * 80)
-        
+
+        if not machine:
+            print("=" * 80)
+            print("DATABASE INSPECTION TOOL")
+            print("=" * 80)
+            print(f"Database Location: {args.db}")
+            print()
+            print("✓ Database file found")
+            print()
+
+        tables = list_tables(cursor, args.table)
+
+        if args.summary:
+            print_summary(conn, tables)
+        else:
+            if not machine:
+                print(f"Tables in database: {len(tables)}")
+                print("-" * 80)
+            for table in tables:
+                print_table(conn, table, args)
+
+        if not machine:
+            print("\n" + "=" * 80)
+            print("DATABASE INSPECTION COMPLETE")
+            print("=" * 80)
+
         conn.close()
-        
+
     except sqlite3.Error as e:
-        print(f"❌ Database error: {e}")
+        print(f"❌ Database error: {e}", file=sys.stderr)
+    except BrokenPipeError:
+        # Output piped into head etc.
+        pass
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}", file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the users database without loading whole tables")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the SQLite database")
+    parser.add_argument("--table", action="append", help="Only inspect this table (repeatable)")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum rows per table")
+    parser.add_argument("--where", default=None,
+                        help="SQL filter for the --table(s) given, e.g. --table users --where \"username LIKE 'a%%'\"")
+    parser.add_argument("--format", choices=["table", "json", "csv"], default="table",
+                        help="Output format; json emits one object per line")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Rows fetched per page")
+    parser.add_argument("--summary", action="store_true",
+                        help="Only show row counts, page usage and indexes")
+    args = parser.parse_args(argv)
+    # Tables have different columns (the FTS shadow tables have no username), so a
+    # filter only makes sense for tables the user picked
+    if args.where and not args.table:
+        parser.error("--where needs --table")
+    return args
+
 
 if __name__ == "__main__":
-    check_database()
\ No newline at end of file
+    check_database(parse_args())
@@ -0,0 +1,179 @@
+# cli.py
+"""
+Headless command-line interface to the Secure Utilities tools.
+
+Never imports tkinter, and each command imports only the backend module it
+needs, so a run pays for its own tool and nothing else. Commands that take
+a value read one item per line from stdin when it is omitted, and write
+one result per line, so they work in pipelines:
+
+    python cli.py shorten https://example.com/a/long/path
+    cat urls.txt | python cli.py shorten
+    python cli.py calc "2^10 + sqrt(16)"
+    cat expressions.txt | python cli.py calc --mode decimal
+    python cli.py fake --count 1000 --format csv > users.csv
+    python cli.py sms send 09171234567 "Hello"
+    python cli.py user add alice            # password prompted, or piped on stdin
+    python cli.py login-check alice
+
+Exit status is 0 on success, 1 if any item failed, 2 for usage errors.
+"""
+import argparse
+import sys
+
+
+def _items(values, stream=sys.stdin):
+    """Command-line values, or non-empty stdin lines if there are none"""
+    if values:
+        yield from values
+        return
+    for line in stream:
+        line = line.rstrip("\r\n")
+        if line:
+            yield line
+
+
+def _read_password(prompt: str = "Password: ") -> str:
+    if sys.stdin.isatty():
+        import getpass
+        return getpass.getpass(prompt)
+    return sys.stdin.readline().rstrip("\r\n")
+
+
+def cmd_shorten(args) -> int:
+    from src.utils.util_shortener import local_short_url, shorten_url
+    shorten = local_short_url if args.offline else shorten_url
+    for url in _items(args.urls):
+        print(shorten(url.strip()))
+    return 0
+
+
+def cmd_calc(args) -> int:
+    from src.utils.calc_engine import CalculatorError, evaluate, format_result
+    status = 0
+    for expr in _items(args.expressions):
+        try:
+            print(format_result(evaluate(expr, args.mode)))
+        except CalculatorError as e:
+            print(f"error: {e}", file=sys.stderr)
+            print("")  # keep output lines aligned with input lines
+            status = 1
+    return status
+
+
+def cmd_fake(args) -> int:
+    from src.utils.fake_data_generator import iter_fake_users
+    fields = ("name", "email", "phone", "address")
+    if args.format == "csv":
+        import csv
+        writer = csv.DictWriter(sys.stdout, fieldnames=fields)
+        writer.writeheader()
+        for user in iter_fake_users(args.count):
+            writer.writerow(user)
+    else:
+        import json
+        for user in iter_fake_users(args.count):
+            sys.stdout.write(json.dumps(user, ensure_ascii=False) + "\n")
+    return 0
+
+
+def cmd_sms_send(args) -> int:
+    from src.utils.sms_messaging import get_sms_config, send_message
+    message = args.message if args.message is not None else sys.stdin.read().strip()
+    config = get_sms_config(args.provider) if args.provider != "simulator" else None
+    result = send_message(args.recipient, message, args.provider, config)
+    print(result.message, file=sys.stdout if result.success else sys.stderr)
+    return 0 if result.success else 1
+
+
+def _init_user_store():
+    from src.database.db_handler import check_user_store_config, init_db
+    try:
+        check_user_store_config()
+    except ValueError as e:
+        sys.exit(f"error: invalid user store configuration: {e}")
+    init_db()
+
+
+def cmd_user_add(args) -> int:
+    from src.utils.password import normalize_credentials
+    from src.utils.validators import validate_registration
+    username, password = normalize_credentials(args.username, _read_password())
+    valid, message = validate_registration(username, password)
+    if not valid:
+        print(f"error: {message}", file=sys.stderr)
+        return 1
+    _init_user_store()
+    from src.auth.accounts import create_account
+    from src.database.repository import UserExistsError
+    try:
+        create_account(username, password)
+    except UserExistsError:
+        print(f"error: username already exists: {username}", file=sys.stderr)
+        return 1
+    print(f"created {username}")
+    return 0
+
+
+def cmd_login_check(args) -> int:
+    password = _read_password()
+    _init_user_store()
+    from src.auth.login import login_user
+    ok = login_user(args.username, password)
+    print("ok" if ok else "invalid username or password", file=sys.stdout if ok else sys.stderr)
+    return 0 if ok else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Secure Utilities from the command line")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    shorten = sub.add_parser("shorten", help="Shorten URLs (arguments or stdin lines)")
+    shorten.add_argument("urls", nargs="*")
+    shorten.add_argument("--offline", action="store_true", help="Local hash links only, no network")
+    shorten.set_defaults(func=cmd_shorten)
+
+    calc = sub.add_parser("calc", help="Evaluate expressions (arguments or stdin lines)")
+    calc.add_argument("expressions", nargs="*")
+    calc.add_argument("--mode", default="float", choices=["float", "decimal", "fraction"])
+    calc.set_defaults(func=cmd_calc)
+
+    fake = sub.add_parser("fake", help="Stream fake user records")
+    fake.add_argument("--count", type=int, default=10)
+    fake.add_argument("--format", default="jsonl", choices=["jsonl", "csv"])
+    fake.set_defaults(func=cmd_fake)
+
+    sms = sub.add_parser("sms", help="SMS messaging")
+    sms_sub = sms.add_subparsers(dest="sms_command", required=True)
+    send = sms_sub.add_parser("send", help="Send one message (body from stdin if omitted)")
+    send.add_argument("recipient")
+    send.add_argument("message", nargs="?")
+    send.add_argument("--provider", default="simulator", choices=["simulator", "semaphore", "twilio"])
+    send.set_defaults(func=cmd_sms_send)
+
+    user = sub.add_parser("user", help="User accounts")
+    user_sub = user.add_subparsers(dest="user_command", required=True)
+    add = user_sub.add_parser("add", help="Create a user (password prompted or read from stdin)")
+    add.add_argument("username")
+    add.set_defaults(func=cmd_user_add)
+
+    check = sub.add_parser("login-check", help="Verify a username/password (exit 0 if valid)")
+    check.add_argument("username")
+    check.set_defaults(func=cmd_login_check)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); not an error for a pipeline
+        sys.stderr.close()
+        return 0
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
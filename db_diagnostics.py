@@ -0,0 +1,291 @@
+"""
+Database health and query-plan profiler for users.db.
+
+Reports, for the statements the app issues:
+- EXPLAIN QUERY PLAN output (is the username index used?)
+- timing over N iterations (writes run inside a rolled-back transaction)
+and for the file itself:
+- dbstat page usage per table/index, redundant indexes, WAL size and
+  checkpoint lag, freelist count
+
+Statements on tables that don't exist yet (sessions, users_fts) are
+skipped. The audit insert is planned and timed against audit.db when it
+exists.
+
+Usage:
+    python db_diagnostics.py [--db PATH] [--audit-db PATH] [--iterations 1000] [--checkpoint]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import time
+
+from check_database import DB_PATH
+
+AUDIT_DB_PATH = os.path.join(os.path.dirname(DB_PATH), "audit.db")
+# Sample session token hash (sha256 digest size); never matches a real session
+DIAG_TOKEN_HASH = bytes(32)
+
+# Every statement the app runs against users.db, with sample parameters:
+# name -> (sql, params(sample username), is_write, table it needs).
+# Keep in sync with src/database/repository.py, src/auth/session.py and
+# src/database/user_search.py when queries change.
+APP_QUERIES = {
+    "login_lookup": (
+        "SELECT password_hash, salt FROM users WHERE username = ?",
+        lambda user: (user,),
+        False, "users",
+    ),
+    "register_insert": (
+        "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)",
+        lambda user: (f"__diag_{time.perf_counter_ns()}", b"\x01" + bytes(32), b"\x01" + bytes(16)),
+        True, "users",
+    ),
+    "availability_scan": (
+        "SELECT username FROM users WHERE username > ? ORDER BY username LIMIT ?",
+        lambda user: ("", 5000),
+        False, "users",
+    ),
+    "list_page": (
+        "SELECT id, username, created_at FROM users WHERE id > ? ORDER BY id LIMIT ?",
+        lambda user: (0, 50),
+        False, "users",
+    ),
+    "prefix_search": (
+        "SELECT id, username FROM users WHERE username >= ? AND username < ? ORDER BY username LIMIT ?",
+        lambda user: (user[:3], user[:2] + chr(ord(user[2:3] or "a") + 1), 50),
+        False, "users",
+    ),
+    "search_fts": (
+        "SELECT rowid, username FROM users_fts WHERE users_fts MATCH ? AND rowid > ? ORDER BY rowid LIMIT ?",
+        lambda user: ('"' + user[-3:].replace('"', '""') + '"', 0, 50),
+        False, "users_fts",
+    ),
+    "search_like": (
+        "SELECT id, username FROM users WHERE username LIKE ? ESCAPE '\\' AND id > ? ORDER BY id LIMIT ?",
+        lambda user: (f"%{user[:2]}%", 0, 50),
+        False, "users",
+    ),
+    "session_insert": (
+        "INSERT INTO sessions (token_hash, username, created_at, expires_at) VALUES (?, ?, ?, ?)",
+        lambda user: (time.perf_counter_ns().to_bytes(32, "big"), user, time.time(), time.time() + 3600),
+        True, "sessions",
+    ),
+    "session_lookup": (
+        "SELECT username, expires_at FROM sessions WHERE token_hash = ?",
+        lambda user: (DIAG_TOKEN_HASH,),
+        False, "sessions",
+    ),
+    "session_revoke": (
+        "DELETE FROM sessions WHERE token_hash = ?",
+        lambda user: (DIAG_TOKEN_HASH,),
+        True, "sessions",
+    ),
+    "session_expire": (
+        "DELETE FROM sessions WHERE expires_at <= ?",
+        lambda user: (0.0,),
+        True, "sessions",
+    ),
+}
+
+# Statements against audit.db (see src/database/audit.py)
+AUDIT_QUERIES = {
+    "audit_insert": (
+        "INSERT INTO audit_log (ts, event, username, detail) VALUES (?, ?, ?, ?)",
+        lambda user: (time.time(), "login_success", user, ""),
+        True, "audit_log",
+    ),
+}
+
+# WAL file layout: 32-byte header, then one 24-byte header per frame
+WAL_HEADER_SIZE = 32
+WAL_FRAME_HEADER_SIZE = 24
+
+
+def sample_username(conn):
+    row = conn.execute("SELECT username FROM users ORDER BY rowid LIMIT 1").fetchone()
+    return row[0] if row else "nonexistent_user"
+
+
+def available_queries(conn, queries):
+    """The queries whose table exists in this database"""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    missing = sorted(name for name, query in queries.items() if query[3] not in tables)
+    if missing:
+        print(f"\n(skipped, table not created yet: {', '.join(missing)})")
+    return {name: query for name, query in queries.items() if query[3] in tables}
+
+
+def report_query_plans(conn, user, queries):
+    print("\n🔎 QUERY PLANS")
+    print("-" * 80)
+    for name, (sql, params, _, _) in queries.items():
+        print(f"\n{name}: {sql}")
+        for _, parent, _, detail in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params(user)):
+            indent = "    " if parent else "  "
+            # FTS MATCH is served by the virtual table's own index, reported as a SCAN
+            flag = "⚠️ " if detail.startswith("SCAN") and "VIRTUAL TABLE" not in detail else ""
+            print(f"{indent}{flag}{detail}")
+
+
+def report_timings(conn, user, iterations, queries):
+    print(f"\n⏱️  QUERY TIMINGS ({iterations} iterations)")
+    print("-" * 80)
+    print(f"{'Query':<20} {'mean µs':>10} {'p50 µs':>10} {'p95 µs':>10} {'max µs':>10}")
+    for name, (sql, params, is_write, _) in queries.items():
+        samples = []
+        if is_write:
+            conn.execute("BEGIN")
+        try:
+            for _ in range(iterations):
+                args = params(user)
+                start = time.perf_counter()
+                conn.execute(sql, args).fetchall()
+                samples.append((time.perf_counter() - start) * 1e6)
+        finally:
+            if is_write:
+                conn.rollback()
+        samples.sort()
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{name:<20} {statistics.mean(samples):>10.1f} {statistics.median(samples):>10.1f} "
+              f"{p95:>10.1f} {samples[-1]:>10.1f}")
+
+
+def report_page_usage(conn):
+    print("\n📦 PAGE USAGE (dbstat)")
+    print("-" * 80)
+    try:
+        rows = conn.execute("""
+            SELECT name, COUNT(*), SUM(pgsize), SUM(unused), SUM(ncell)
+            FROM dbstat GROUP BY name ORDER BY SUM(pgsize) DESC
+        """).fetchall()
+    except sqlite3.OperationalError:
+        print("  dbstat is not available in this SQLite build")
+        return
+    print(f"{'Object':<28} {'pages':>8} {'KiB':>10} {'unused %':>9} {'cells':>10}")
+    for name, pages, size, unused, cells in rows:
+        pct = 100.0 * unused / size if size else 0.0
+        print(f"{name:<28} {pages:>8} {size / 1024:>10.1f} {pct:>8.1f}% {cells:>10}")
+
+
+def report_redundant_indexes(conn):
+    """Indexes whose column list duplicates another index on the same table"""
+    print("\n🗂️  REDUNDANT INDEXES")
+    print("-" * 80)
+    found = False
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+    for table in tables:
+        seen = {}
+        # Unique indexes first, so the plain duplicate is the one reported
+        indexes = sorted(conn.execute(f"PRAGMA index_list(\"{table}\")").fetchall(), key=lambda r: -r[2])
+        for _, name, unique, _, _ in indexes:
+            columns = tuple(col[2] for col in conn.execute(f"PRAGMA index_info(\"{name}\")"))
+            if columns in seen:
+                found = True
+                print(f"  ⚠️  {name} duplicates {seen[columns]} on {table}({', '.join(columns)})")
+            else:
+                seen[columns] = name
+    if not found:
+        print("  none")
+
+
+def report_file_health(conn, path, checkpoint):
+    print("\n🩺 FILE HEALTH")
+    print("-" * 80)
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+    print(f"Journal mode:   {journal}")
+    print(f"Auto vacuum:    {('none', 'full', 'incremental')[auto_vacuum]}")
+    print(f"Page size:      {page_size} bytes")
+    print(f"Pages:          {page_count} ({page_size * page_count / 1024:.1f} KiB)")
+    pct = 100.0 * freelist / page_count if page_count else 0.0
+    print(f"Freelist pages: {freelist} ({pct:.1f}% of file)")
+
+    wal_path = path + "-wal"
+    if os.path.exists(wal_path):
+        wal_size = os.path.getsize(wal_path)
+        frames = max(0, (wal_size - WAL_HEADER_SIZE) // (page_size + WAL_FRAME_HEADER_SIZE))
+        print(f"WAL size:       {wal_size / 1024:.1f} KiB ({frames} frames)")
+    else:
+        print("WAL size:       no -wal file")
+
+    if checkpoint:
+        busy, log_frames, done = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        if log_frames < 0:
+            print("Checkpoint:     not in WAL mode")
+        else:
+            print(f"Checkpoint lag: {log_frames - done} of {log_frames} frames not yet in the database"
+                  f"{' (busy)' if busy else ''}")
+
+
+def report_audit_queries(path, user, iterations):
+    print(f"\n🧾 AUDIT LOG ({path})")
+    print("-" * 80)
+    if not os.path.exists(path):
+        print("  audit.db not found; skipped")
+        return
+    conn = sqlite3.connect(path, timeout=10.0, isolation_level=None)
+    try:
+        queries = available_queries(conn, AUDIT_QUERIES)
+        report_query_plans(conn, user, queries)
+        report_timings(conn, user, iterations, queries)
+    finally:
+        conn.close()
+
+
+def run_diagnostics(path, iterations=1000, checkpoint=False, audit_path=AUDIT_DB_PATH):
+    """Print the full diagnostics report for the database at path"""
+    if not os.path.exists(path):
+        print(f"❌ Database file not found: {path}")
+        return 1
+
+    conn = sqlite3.connect(path, timeout=10.0, isolation_level=None)
+    try:
+        print("=" * 80)
+        print("DATABASE DIAGNOSTICS")
+        print("=" * 80)
+        print(f"Database Location: {path}")
+
+        user = sample_username(conn)
+        queries = available_queries(conn, APP_QUERIES)
+        report_query_plans(conn, user, queries)
+        report_timings(conn, user, iterations, queries)
+        report_page_usage(conn)
+        report_redundant_indexes(conn)
+        report_file_health(conn, path, checkpoint)
+        report_audit_queries(audit_path, user, iterations)
+        print("\n" + "=" * 80)
+        return 0
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query-plan and health report for users.db")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the SQLite database")
+    parser.add_argument("--audit-db", default=AUDIT_DB_PATH, help="Path to the audit log database")
+    parser.add_argument("--iterations", type=_positive_int, default=1000, help="Timing iterations per query (at least 1)")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Run a PASSIVE WAL checkpoint to measure checkpoint lag")
+    args = parser.parse_args(argv)
+    return run_diagnostics(args.db, args.iterations, args.checkpoint, args.audit_db)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
+import argparse
+import logging
 import sys
 import os
 
@@ -7,11 +9,21 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Simplified imports
-from src.database.db_handler import init_db
+from src.database.db_handler import check_user_store_config, init_db
+from src.database.maintenance import start_maintenance
+from src.database.audit import audit_log
+from src.utils import metrics
+from src.utils.profiling import PROFILE_ENABLED, profiler
+from src.utils.log_setup import LOG_FILE, LOG_JSON, LOG_LEVEL, setup_logging
 from src.auth.login import login_user
 from src.auth.register import register_user
+from src.auth.session import session_store
+from src.auth.availability import username_availability
+from src.utils.validators import validate_registration, validate_username
 from src.utilities_menu import build_dashboard
 
+logger = logging.getLogger(__name__)
+
 # Professional Black/Yellow/White color scheme
 COLORS = {
     'black': '#1a1a1a',
@@ -21,12 +33,18 @@ COLORS = {
     'white': '#ffffff',
     'light_gray': '#f5f5f5',
     'text_dark': '#1a1a1a',
-    'border': '#e0e0e0'
+    'border': '#e0e0e0',
+    'success': '#2e7d32',
+    'error': '#c62828'
 }
 
-def show_dashboard(root, username):
+# Wait this long after the last keystroke before checking a username
+AVAILABILITY_DELAY_MS = 300
+AVAILABILITY_POLL_MS = 30
+
+def show_dashboard(root, username, session_token=None):
     """Create and show the dashboard"""
-    print(f"DEBUG: Building dashboard for {username}")
+    logger.debug("Building dashboard")
     
     try:
         # Clear the login screen
@@ -34,14 +52,12 @@ def show_dashboard(root, username):
             widget.destroy()
         
         # Build the accessible dashboard directly in the root window
-        dashboard = build_dashboard(root, username)
+        dashboard = build_dashboard(root, username, session_token)
         
-        print("DEBUG: Dashboard created successfully")
+        logger.debug("Dashboard created")
         
     except Exception as e:
-        print(f"ERROR: Failed to create dashboard: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to create dashboard")
         messagebox.showerror("Error", f"Failed to create dashboard: {e}")
 
 def handle_login(root, username_entry, password_entry):
@@ -53,11 +69,17 @@ def handle_login(root, username_entry, password_entry):
         messagebox.showerror("Error", "Please enter both username and password")
         return
     
-    print(f"DEBUG: Login attempt for user: {username}")
+    # No usernames in logs; the audit log records who
+    logger.debug("Login attempt")
     
-    if login_user(username, password):
+    with profiler.section("login"):
+        ok = login_user(username, password)
+    if ok:
+        # Later checks validate this token instead of re-hashing the password
+        token = session_store.create(username)
         messagebox.showinfo("Success", "Login successful!")
-        show_dashboard(root, username)
+        with profiler.section("show_dashboard"):
+            show_dashboard(root, username, token)
     else:
         messagebox.showerror("Error", "Invalid username or password")
         password_entry.delete(0, tk.END)
@@ -76,11 +98,12 @@ def handle_register(username_entry, password_entry, confirm_entry):
         messagebox.showerror("Error", "Passwords do not match!")
         return
     
-    if len(password) < 6:
-        messagebox.showerror("Error", "Password must be at least 6 characters long")
+    valid, message = validate_registration(username, password)
+    if not valid:
+        messagebox.showerror("Error", message)
         return
     
-    print(f"DEBUG: Registration attempt for user: {username}")
+    logger.debug("Registration attempt")
     
     if register_user(username, password):
         messagebox.showinfo("Success", "Registration successful! You can now login.")
@@ -90,6 +113,51 @@ def handle_register(username_entry, password_entry, confirm_entry):
     else:
         messagebox.showerror("Error", "Registration failed. Username may already exist.")
 
+def bind_availability_check(root, username_entry, label):
+    """Check the username as the user types, debounced and off the UI thread"""
+    state = {"after_id": None}
+    username_availability.warm()
+
+    def show_result(username, future):
+        if username_entry.winfo_exists() and username_entry.get().strip() == username:
+            try:
+                taken = future.result()
+            except Exception:
+                label.config(text="")
+                return
+            if taken:
+                label.config(text="✗ Username already taken", fg=COLORS['error'])
+            else:
+                label.config(text="✓ Username available", fg=COLORS['success'])
+
+    def poll(username, future):
+        if not label.winfo_exists():
+            return
+        if future.done():
+            show_result(username, future)
+        else:
+            root.after(AVAILABILITY_POLL_MS, poll, username, future)
+
+    def check():
+        state["after_id"] = None
+        username = username_entry.get().strip()
+        if not username:
+            label.config(text="")
+            return
+        valid, message = validate_username(username)
+        if not valid:
+            label.config(text=message, fg=COLORS['text_dark'])
+            return
+        label.config(text="Checking…", fg=COLORS['text_dark'])
+        poll(username, username_availability.check_async(username))
+
+    def on_key(event=None):
+        if state["after_id"] is not None:
+            root.after_cancel(state["after_id"])
+        state["after_id"] = root.after(AVAILABILITY_DELAY_MS, check)
+
+    username_entry.bind("<KeyRelease>", on_key)
+
 def show_register_form(root, login_container):
     """Show registration form"""
     # Clear login container
@@ -124,7 +192,7 @@ def show_register_form(root, login_container):
             fg=COLORS['text_dark']).pack(anchor="w", pady=(0, 5))
     
     username_frame = tk.Frame(form, bg=COLORS['border'], bd=1)
-    username_frame.pack(fill="x", pady=(0, 20))
+    username_frame.pack(fill="x", pady=(0, 2))
     
     username_entry = tk.Entry(username_frame,
                               font=("Segoe UI", 11),
@@ -134,6 +202,14 @@ def show_register_form(root, login_container):
     username_entry.pack(fill="x", padx=2, pady=2, ipady=10, ipadx=10)
     username_entry.focus()
     
+    availability_label = tk.Label(form,
+                                  text="",
+                                  font=("Segoe UI", 9),
+                                  bg=COLORS['light_gray'],
+                                  fg=COLORS['text_dark'])
+    availability_label.pack(anchor="w", pady=(0, 12))
+    bind_availability_check(root, username_entry, availability_label)
+    
     # Password
     tk.Label(form,
             text="Password",
@@ -399,9 +475,48 @@ def setup_login_ui(root):
     password_entry.bind('<Return>', lambda e: handle_login(root, username_entry, password_entry))
     username_entry.bind('<Return>', lambda e: password_entry.focus())
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Secure Utilities")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile startup, login and dashboard actions (reports in profiles/)")
+    parser.add_argument("--log-level", default=LOG_LEVEL,
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"], type=str.upper)
+    parser.add_argument("--log-json", action="store_true", default=LOG_JSON, help="Log one JSON object per line")
+    parser.add_argument("--log-file", default=LOG_FILE, help="Also log to this rotating file")
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
+    setup_logging(args.log_level, args.log_json, args.log_file)
+    try:
+        check_user_store_config()
+    except ValueError as e:
+        sys.exit(f"❌ Invalid user store configuration: {e}")
+    if args.profile or PROFILE_ENABLED:
+        profiler.start()
+
+    with profiler.section("startup"):
+        root, maintenance = start_app()
+
+    # Start the application
+    root.mainloop()
+    report_dir = profiler.stop()
+    if report_dir:
+        # Asked for with --profile, so shown regardless of the log level
+        print(f"Profile reports written to {report_dir}")
+    maintenance.stop()
+    audit_log.stop()
+
+def start_app():
+    """Initialize the database and background services and build the login window"""
     # Initialize database
     init_db()
+
+    # Checkpoint / vacuum / optimize in the background, off the Tk thread
+    maintenance = start_maintenance()
+
+    # Prometheus endpoint / file dump, if enabled by environment variables
+    metrics.start_from_env()
     
     root = tk.Tk()
     root.title("Secure Utilities - Login")
@@ -420,9 +535,7 @@ def main():
 
     # Setup login UI
     setup_login_ui(root)
-    
-    # Start the application
-    root.mainloop()
+    return root, maintenance
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,8 +1,8 @@
 import sqlite3
+from src.database.user_search import iter_users
 conn = sqlite3.connect("src/database/users.db")
-cursor = conn.cursor()
-cursor.execute("SELECT * FROM users")
 print("Users in database:")
-for row in cursor.fetchall():
-    print(f"ID: {row[0]}, Username: {row[1]}, Created: {row[4] if len(row) > 4 else 'N/A'}")
+# Paged by id so large tables aren't loaded into memory at once
+for user_id, username, created_at in iter_users(conn):
+    print(f"ID: {user_id}, Username: {username}, Created: {created_at or 'N/A'}")
 conn.close()
\ No newline at end of file
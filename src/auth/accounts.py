@@ -0,0 +1,32 @@
+# src/auth/accounts.py
+"""
+Account creation without any UI, shared by the Tk registration form
+(register_user) and the command-line interface.
+"""
+from src.utils.password import hash_password, normalize_credentials
+from src.database.credential_cache import credential_cache
+from src.database.credential_codec import encode_credential
+from src.database.repository import UserExistsError, get_user_repository
+from src.database.audit import audit_log, REGISTER, REGISTER_FAILURE
+from src.auth.availability import username_availability
+
+def create_account(username: str, password: str):
+    """
+    Hash the password and insert the user. Both values are normalized the
+    same way login_user normalizes them.
+    Raises UserExistsError if the username is taken; other storage errors propagate.
+    """
+    username, password = normalize_credentials(username, password)
+    hashed, salt = hash_password(password)
+    try:
+        get_user_repository().create_user(username, encode_credential(hashed), encode_credential(salt))
+    except UserExistsError:
+        username_availability.mark_taken(username)
+        audit_log.record(REGISTER_FAILURE, username, "username exists")
+        raise
+    except Exception as e:
+        audit_log.record(REGISTER_FAILURE, username, type(e).__name__)
+        raise
+    credential_cache.invalidate(username)
+    username_availability.mark_taken(username)
+    audit_log.record(REGISTER, username)
@@ -0,0 +1,149 @@
+# src/auth/availability.py
+"""
+As-you-type username availability for the registration form.
+
+Lookups run on a single worker thread so the Tk loop never touches disk.
+Each check goes through, in order:
+1. a small LRU/TTL cache of recent answers
+2. a Bloom filter of existing usernames - a miss means "available" for sure
+3. the user repository (indexed lookup), only for Bloom hits
+
+The Bloom filter is built on its own background thread from the repository
+on first use and swapped in whole when complete, so checks never wait for
+the scan; until it is ready every check falls through to the repository.
+register_user adds names registered by this process, and the filter is
+rebuilt every BLOOM_REBUILD_SECONDS to pick up users created elsewhere
+(CLI, other app instances, imports). A name created elsewhere can therefore
+show as available for up to that long; the INSERT still rejects it.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple
+import logging
+import threading
+import time
+
+from src.database.repository import get_user_repository
+from src.utils.bloom import BloomFilter
+
+CACHE_MAX_ENTRIES = 256
+# Short, since another client may register the name meanwhile
+CACHE_TTL_SECONDS = 30.0
+BLOOM_ERROR_RATE = 0.01
+# Headroom for registrations after the filter is built
+BLOOM_MIN_CAPACITY = 10000
+SCAN_PAGE_SIZE = 5000
+# Rebuild the filter this often (checked on each availability check)
+BLOOM_REBUILD_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class UsernameAvailability:
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="username-check")
+        self._cache: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_thread: Optional[threading.Thread] = None
+        self._next_build_at = 0.0
+        # Names marked taken while a scan runs, added to the new filter before the swap
+        self._marked_during_scan = []
+        self.cache_hits = 0
+        self.bloom_skips = 0
+        self.db_lookups = 0
+
+    def warm(self):
+        """Start building the Bloom filter in the background if it is missing or stale"""
+        with self._lock:
+            now = time.monotonic()
+            building = self._bloom_thread is not None and self._bloom_thread.is_alive()
+            if not building and now >= self._next_build_at:
+                # Also spaces out retries if a scan fails
+                self._next_build_at = now + BLOOM_REBUILD_SECONDS
+                self._marked_during_scan = []
+                self._bloom_thread = threading.Thread(target=self._build_bloom, name="username-bloom", daemon=True)
+                self._bloom_thread.start()
+
+    def _build_bloom(self):
+        repository = get_user_repository()
+        names, after = [], ""
+        try:
+            while True:
+                page = repository.list_users(SCAN_PAGE_SIZE, after)
+                if not page:
+                    break
+                names.extend(page)
+                after = page[-1]
+        except Exception:
+            # Keep the previous filter (if any); warm() retries after BLOOM_REBUILD_SECONDS
+            logger.warning("Username Bloom filter scan failed", exc_info=True)
+            return
+        bloom = BloomFilter(max(len(names) * 2, BLOOM_MIN_CAPACITY), BLOOM_ERROR_RATE)
+        for name in names:
+            bloom.add(name)
+        with self._lock:
+            for name in self._marked_during_scan:
+                bloom.add(name)
+            self._marked_during_scan = []
+            # A single reference assignment, so checks see either no filter or a complete one
+            self._bloom = bloom
+
+    def _cached(self, username: str) -> Optional[bool]:
+        with self._lock:
+            entry = self._cache.get(username)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            self._cache.move_to_end(username)
+            return entry[1]
+
+    def _remember(self, username: str, taken: bool):
+        with self._lock:
+            self._cache[username] = (time.monotonic() + CACHE_TTL_SECONDS, taken)
+            self._cache.move_to_end(username)
+            while len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def is_taken(self, username: str) -> bool:
+        """Blocking check; call from a worker thread (see check_async)"""
+        cached = self._cached(username)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        bloom = self._bloom
+        if bloom is not None and username not in bloom:
+            self.bloom_skips += 1
+            taken = False
+        else:
+            self.db_lookups += 1
+            taken = get_user_repository().get_credentials(username) is not None
+        self._remember(username, taken)
+        return taken
+
+    def check_async(self, username: str) -> Future:
+        """Future resolving to True if the username is taken"""
+        self.warm()
+        return self._executor.submit(self.is_taken, username)
+
+    def mark_taken(self, username: str):
+        """Record a username that now exists (after register_user)"""
+        self._remember(username, True)
+        with self._lock:
+            if self._bloom_thread is not None and self._bloom_thread.is_alive():
+                self._marked_during_scan.append(username)
+            bloom = self._bloom
+        if bloom is not None:
+            bloom.add(username)
+
+    def stats(self):
+        return {
+            "bloom_ready": self._bloom is not None,
+            "bloom_entries": len(self._bloom) if self._bloom is not None else 0,
+            "cache_hits": self.cache_hits,
+            "bloom_skips": self.bloom_skips,
+            "db_lookups": self.db_lookups
+        }
+
+
+# Shared instance used by the registration form and register_user
+username_availability = UsernameAvailability()
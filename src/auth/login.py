@@ -1,22 +1,33 @@
 # src/auth/login.py
-import sqlite3
-from src.utils.password import hash_password
-from src.database.db_handler import DB_NAME
+from src.utils.password import hash_password, normalize_credentials
+from src.database.credential_cache import credential_cache
+from src.database.credential_codec import decode_credential
+from src.database.repository import get_user_repository
+from src.database.audit import audit_log, LOGIN_FAILURE, LOGIN_SUCCESS
+from src.utils.metrics import registry, timed
 
+@timed("login_user")
 def login_user(username: str, password: str) -> bool:
-    username = (username or "").strip()
-    password = (password or "").strip()
+    ok = _check_credentials(username, password)
+    if registry.enabled:
+        registry.counter("logins_total" if ok else "login_failures_total").inc()
+    audit_log.record(LOGIN_SUCCESS if ok else LOGIN_FAILURE, (username or "").strip())
+    return ok
+
+def _check_credentials(username: str, password: str) -> bool:
+    username, password = normalize_credentials(username, password)
     if not username or not password:
         return False
 
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cur = conn.cursor()
-        cur.execute("SELECT password_hash, salt FROM users WHERE username = ?", (username,))
-        row = cur.fetchone()
-        conn.close()
-        if not row:
-            return False
+        row = credential_cache.get(username)
+        if row is None:
+            row = get_user_repository().get_credentials(username)
+            if not row:
+                return False
+            # Rows may be legacy hex TEXT or versioned BLOBs during migration
+            row = (decode_credential(row[0]), decode_credential(row[1]))
+            credential_cache.put(username, row)
         stored_hash, salt = row
         entered_hash, _ = hash_password(password, salt)
         return stored_hash == entered_hash
@@ -1,33 +1,31 @@
 # src/auth/register.py
-import sqlite3
 from tkinter import messagebox
-from src.utils.password import hash_password
-from src.database.db_handler import DB_NAME
+from src.auth.accounts import create_account
+from src.database.repository import UserExistsError
+from src.utils.metrics import timed
+from src.utils.password import normalize_credentials
+from src.utils.validators import validate_registration
 
+@timed("register_user")
 def register_user(username: str, password: str) -> bool:
     """
     Create a new user. Returns True on success, False on failure.
     Uses messageboxes for user feedback from GUI.
     """
-    username = (username or "").strip()
-    password = (password or "").strip()
+    username, password = normalize_credentials(username, password)
     if not username or not password:
         messagebox.showwarning("Missing", "Please enter both username and password.")
         return False
+    valid, message = validate_registration(username, password)
+    if not valid:
+        messagebox.showerror("Error", message)
+        return False
 
-    hashed, salt = hash_password(password)
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)",
-            (username, hashed, salt)
-        )
-        conn.commit()
-        conn.close()
+        create_account(username, password)
         messagebox.showinfo("Success", "Account created successfully.")
         return True
-    except sqlite3.IntegrityError:
+    except UserExistsError:
         messagebox.showerror("Error", "Username already exists.")
         return False
     except Exception as e:
@@ -0,0 +1,144 @@
+# src/auth/session.py
+"""
+Session tokens issued after a successful login.
+
+The raw token is only handed to the caller; the sessions table stores its
+SHA-256, so a leaked database can't be replayed. Validation goes through an
+in-memory index (token hash -> username, expiry) and expired sessions are
+removed with a timing wheel: tokens are bucketed by expiry slot, so each
+sweep only touches the buckets that have come due instead of scanning every
+session. A valid session costs one SHA-256 of the token and a dict lookup,
+instead of a users-table query plus the salted SHA-256 password check
+that login_user does.
+"""
+from typing import Dict, Optional, Set, Tuple
+import hashlib
+import secrets
+import sqlite3
+import threading
+import time
+
+from src.database.db_handler import DB_NAME, configure_connection
+from src.utils.metrics import registry
+
+SESSION_TTL = 8 * 3600.0
+# Width of one timing-wheel slot in seconds
+WHEEL_GRANULARITY = 60.0
+
+
+def _hash_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def create_sessions_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            token_hash BLOB PRIMARY KEY,
+            username TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)")
+
+
+class SessionStore:
+    def __init__(self, db_path: str = DB_NAME, ttl: float = SESSION_TTL,
+                 granularity: float = WHEEL_GRANULARITY):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.granularity = granularity
+        self._index: Dict[bytes, Tuple[str, float]] = {}
+        self._wheel: Dict[int, Set[bytes]] = {}
+        self._swept_slot = int(time.time() // granularity)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = configure_connection(
+                sqlite3.connect(self.db_path, timeout=10.0, check_same_thread=False)
+            )
+            create_sessions_table(self._conn.cursor())
+            self._conn.commit()
+        return self._conn
+
+    def _slot(self, expires_at: float) -> int:
+        return int(expires_at // self.granularity)
+
+    def _add(self, token_hash: bytes, username: str, expires_at: float):
+        self._index[token_hash] = (username, expires_at)
+        self._wheel.setdefault(self._slot(expires_at), set()).add(token_hash)
+
+    def create(self, username: str) -> str:
+        """Issue a new session token for username"""
+        token = secrets.token_urlsafe(32)
+        token_hash = _hash_token(token)
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.execute(
+                    "INSERT INTO sessions (token_hash, username, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (token_hash, username, now, expires_at)
+                )
+            self._add(token_hash, username, expires_at)
+        return token
+
+    def validate(self, token: Optional[str]) -> Optional[str]:
+        """Username for a live session token, or None"""
+        if not token:
+            return None
+        token_hash = _hash_token(token)
+        now = time.time()
+        with self._lock:
+            self._sweep(now)
+            entry = self._index.get(token_hash)
+            if entry is None:
+                # Not seen by this process yet (e.g. after a restart) - load it once
+                row = self._db().execute(
+                    "SELECT username, expires_at FROM sessions WHERE token_hash = ?", (token_hash,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._add(token_hash, row[0], row[1])
+                entry = row
+        username, expires_at = entry
+        return username if expires_at > now else None
+
+    def revoke(self, token: Optional[str]):
+        """End a session (logout)"""
+        if not token:
+            return
+        token_hash = _hash_token(token)
+        with self._lock:
+            entry = self._index.pop(token_hash, None)
+            if entry is not None:
+                self._wheel.get(self._slot(entry[1]), set()).discard(token_hash)
+            conn = self._db()
+            with conn:
+                conn.execute("DELETE FROM sessions WHERE token_hash = ?", (token_hash,))
+
+    def _sweep(self, now: float):
+        """Drop every wheel slot that has fully expired; caller holds the lock"""
+        current = self._slot(now)
+        if current <= self._swept_slot:
+            return
+        expired = []
+        for slot in [slot for slot in self._wheel if slot < current]:
+            expired.extend(self._wheel.pop(slot))
+        self._swept_slot = current
+        for token_hash in expired:
+            self._index.pop(token_hash, None)
+        conn = self._db()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (current * self.granularity,))
+
+    def __len__(self):
+        return len(self._index)
+
+
+# Shared store used by the login flow and dashboard
+session_store = SessionStore()
+registry.gauge("sessions_active", "Sessions held in memory", lambda: len(session_store))
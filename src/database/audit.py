@@ -0,0 +1,203 @@
+# src/database/audit.py
+"""
+Audit trail of logins, failures, registrations and logouts.
+
+record() only appends to a bounded in-memory ring buffer; a background
+thread drains it in batched transactions into an append-only table in a
+separate audit.db, so auditing adds no write load to users.db and never
+blocks the caller. When the buffer is full the oldest event is dropped and
+counted rather than letting memory grow.
+"""
+from collections import deque
+from typing import List, Tuple
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from src.database.db_handler import DB_DIR, configure_connection
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+AUDIT_DB_NAME = os.path.join(DB_DIR, "audit.db")
+BUFFER_SIZE = 10000
+FLUSH_BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0
+# Longest wait between attempts to open audit.db after a failure (seconds)
+OPEN_RETRY_MAX = 60.0
+
+LOGIN_SUCCESS = "login_success"
+LOGIN_FAILURE = "login_failure"
+REGISTER = "register"
+REGISTER_FAILURE = "register_failure"
+LOGOUT = "logout"
+
+
+def create_audit_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS audit_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts REAL NOT NULL,
+            event TEXT NOT NULL,
+            username TEXT,
+            detail TEXT
+        )
+    """)
+    # Append-only: rows can be inserted but never changed or removed
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS audit_log_no_update
+        BEFORE UPDATE ON audit_log
+        BEGIN SELECT RAISE(ABORT, 'audit_log is append-only'); END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS audit_log_no_delete
+        BEFORE DELETE ON audit_log
+        BEGIN SELECT RAISE(ABORT, 'audit_log is append-only'); END
+    """)
+
+
+class AuditLog:
+    def __init__(self, db_path: str = AUDIT_DB_NAME, buffer_size: int = BUFFER_SIZE,
+                 batch_size: int = FLUSH_BATCH_SIZE, interval: float = FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.interval = interval
+        self._buffer: "deque[Tuple[float, str, str, str]]" = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._atexit_registered = False
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.write_errors = 0
+
+    def record(self, event: str, username: str = "", detail: str = ""):
+        """Queue an event; never blocks on disk"""
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1  # deque discards the oldest entry on append
+            self._buffer.append((time.time(), event, username, detail))
+            self.recorded += 1
+            pending = len(self._buffer)
+        if self._thread is None:
+            self.start()
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the writer after flushing whatever is buffered"""
+        self._stop.set()
+        self._wakeup.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _drain(self, limit: int) -> List[Tuple[float, str, str, str]]:
+        with self._lock:
+            count = min(limit, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = configure_connection(sqlite3.connect(self.db_path, timeout=10.0))
+        try:
+            create_audit_table(conn.cursor())
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _drop_pending(self) -> int:
+        """Discard everything buffered, counted as write errors like a failed flush"""
+        lost = len(self._drain(self._buffer.maxlen))
+        self.write_errors += lost
+        return lost
+
+    def _open_with_retry(self):
+        """Connection to audit.db, retrying with backoff; None if stopped first"""
+        delay = self.interval
+        while True:
+            try:
+                return self._connect()
+            except sqlite3.Error as e:
+                # Locked or missing: drop what can't be written rather than let memory fill
+                lost = self._drop_pending()
+                logger.warning("Audit log unavailable (%s); dropped %d events, retrying in %.0fs",
+                               e, lost, delay)
+            if self._stop.wait(delay):
+                self._drop_pending()
+                return None
+            delay = min(delay * 2, OPEN_RETRY_MAX)
+
+    def _run(self):
+        try:
+            conn = self._open_with_retry()
+            if conn is None:
+                return
+            try:
+                while True:
+                    self._wakeup.wait(self.interval)
+                    self._wakeup.clear()
+                    stopping = self._stop.is_set()
+                    self.flush(conn)
+                    if stopping:
+                        return
+            finally:
+                conn.close()
+        except Exception:
+            logger.exception("Audit writer stopped unexpectedly")
+        finally:
+            # Lets record() start a fresh writer if this one died
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def flush(self, conn: sqlite3.Connection):
+        """Write all buffered events, one transaction per batch"""
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO audit_log (ts, event, username, detail) VALUES (?, ?, ?, ?)", batch
+                    )
+                self.written += len(batch)
+            except sqlite3.Error as e:
+                # Locked or failing disk: count the loss rather than block callers
+                self.write_errors += len(batch)
+                logger.warning("Dropped %d audit events: %s", len(batch), e)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "recorded": self.recorded,
+                "written": self.written,
+                "pending": len(self._buffer),
+                "dropped": self.dropped,
+                "write_errors": self.write_errors
+            }
+
+
+# Shared instance fed by auth and the dashboard
+audit_log = AuditLog()
+registry.gauge("audit_pending", "Audit events waiting to be written", lambda: audit_log.stats()["pending"])
+registry.gauge("audit_dropped", "Audit events dropped on overflow", lambda: audit_log.stats()["dropped"])
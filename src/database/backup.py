@@ -0,0 +1,291 @@
+# src/database/backup.py
+"""
+Online backup and restore for users.db.
+Backups use SQLite's backup API a few pages at a time with a short sleep
+between steps, so logins and registrations keep running while a snapshot is
+taken. A write from another connection restarts the copy; after MAX_RESTARTS
+restarts it finishes in one step instead, so steady writes can't keep it
+going forever. Snapshots are gzip-compressed and get a .sha256 sidecar; restore
+verifies the checksum and integrity before copying pages back in.
+
+Usage:
+    python -m src.database.backup create [--dest backups]
+    python -m src.database.backup verify backups/users-20250101-120000-123456.db.gz
+    python -m src.database.backup restore backups/users-20250101-120000-123456.db.gz
+    python -m src.database.backup benchmark
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+import argparse
+import gzip
+import hashlib
+import os
+import pathlib
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from src.database.db_handler import DB_DIR, DB_NAME
+
+BACKUP_DIR = os.path.join(DB_DIR, "backups")
+# Pages copied per step and pause between steps - small steps keep writer stalls short
+STEP_PAGES = 64
+STEP_SLEEP = 0.005
+CHUNK_SIZE = 1024 * 1024
+# Restarts (source written mid-copy) tolerated before finishing in a single step
+MAX_RESTARTS = 5
+
+
+class BackupError(Exception):
+    """Raised when a snapshot is missing, corrupt or fails verification."""
+
+
+@dataclass
+class BackupResult:
+    path: str
+    checksum: str
+    pages: int
+    size_bytes: int
+    compressed_bytes: int
+    seconds: float
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def _online_copy(source: sqlite3.Connection, target_path: str, pages: int, sleep: float,
+                 max_restarts: int = MAX_RESTARTS) -> int:
+    """Copy source into target_path with the backup API; returns total pages."""
+    state = {"pages": 0, "remaining": None, "restarts": 0}
+
+    def progress(status, remaining, count):
+        state["pages"] = count
+        # SQLite starts over when another connection writes; remaining jumps back up
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > max_restarts:
+                raise _TooManyRestarts()
+        state["remaining"] = remaining
+
+    target = sqlite3.connect(target_path)
+    try:
+        try:
+            source.backup(target, pages=pages, progress=progress, sleep=sleep)
+        except _TooManyRestarts:
+            # One step copies everything under a single read transaction, so it can't restart
+            source.backup(target, pages=-1)
+            state["pages"] = target.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        target.close()
+    return state["pages"]
+
+
+def _snapshot_path(dest_dir: str, name: str) -> str:
+    """Unused snapshot path, unique even for several backups within one second"""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    path = os.path.join(dest_dir, f"{name}-{stamp}.db.gz")
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(dest_dir, f"{name}-{stamp}-{counter}.db.gz")
+        counter += 1
+    return path
+
+
+def create_backup(
+    db_path: str = DB_NAME,
+    dest_dir: str = BACKUP_DIR,
+    pages: int = STEP_PAGES,
+    sleep: float = STEP_SLEEP
+) -> BackupResult:
+    """Take a compressed, checksummed snapshot of a live database."""
+    if not os.path.exists(db_path):
+        raise BackupError(f"Database not found: {db_path}")
+    os.makedirs(dest_dir, exist_ok=True)
+
+    path = _snapshot_path(dest_dir, os.path.splitext(os.path.basename(db_path))[0])
+
+    start = time.perf_counter()
+    fd, raw_path = tempfile.mkstemp(suffix=".db", dir=dest_dir)
+    os.close(fd)
+    try:
+        source = sqlite3.connect(db_path, timeout=10.0)
+        try:
+            page_count = _online_copy(source, raw_path, pages, sleep)
+        finally:
+            source.close()
+
+        size = os.path.getsize(raw_path)
+        with open(raw_path, "rb") as src, gzip.open(path, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    finally:
+        os.remove(raw_path)
+
+    checksum = _sha256_file(path)
+    with open(path + ".sha256", "w", encoding="utf-8") as f:
+        f.write(f"{checksum}  {os.path.basename(path)}\n")
+
+    return BackupResult(
+        path=path,
+        checksum=checksum,
+        pages=page_count,
+        size_bytes=size,
+        compressed_bytes=os.path.getsize(path),
+        seconds=time.perf_counter() - start
+    )
+
+
+def verify_backup(path: str) -> str:
+    """Check a snapshot against its .sha256 sidecar. Returns the checksum."""
+    if not os.path.exists(path):
+        raise BackupError(f"Backup not found: {path}")
+    try:
+        with open(path + ".sha256", encoding="utf-8") as f:
+            expected = f.read().split()[0]
+    except (OSError, IndexError):
+        raise BackupError(f"Missing or empty checksum file: {path}.sha256")
+    actual = _sha256_file(path)
+    if actual != expected:
+        raise BackupError(f"Checksum mismatch for {path}")
+    return actual
+
+
+def restore_backup(path: str, db_path: str = DB_NAME, pages: int = STEP_PAGES, sleep: float = STEP_SLEEP):
+    """
+    Verify a snapshot and copy it over db_path through the backup API, so
+    open connections see a consistent switch instead of a half-copied file.
+    """
+    verify_backup(path)
+    fd, raw_path = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(os.path.abspath(db_path)))
+    os.close(fd)
+    try:
+        with gzip.open(path, "rb") as src, open(raw_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+        snapshot = sqlite3.connect(raw_path)
+        try:
+            result = snapshot.execute("PRAGMA integrity_check").fetchone()[0]
+            if result != "ok":
+                raise BackupError(f"Snapshot failed integrity check: {result}")
+            target = sqlite3.connect(db_path, timeout=10.0)
+            try:
+                snapshot.backup(target, pages=pages, sleep=sleep)
+            finally:
+                target.close()
+        finally:
+            snapshot.close()
+    finally:
+        os.remove(raw_path)
+
+
+def benchmark(db_path: str = DB_NAME, dest_dir: Optional[str] = None, duration: float = 2.0):
+    """
+    Measure backup throughput and login-lookup latency with and without a
+    backup running. Returns a dict of results. Without dest_dir the snapshot
+    goes to a temporary directory that is removed afterwards.
+    """
+    if dest_dir is None:
+        with tempfile.TemporaryDirectory(prefix="backup-bench-") as tmp:
+            return benchmark(db_path, tmp, duration)
+
+    if not os.path.exists(db_path):
+        raise BackupError(f"Database not found: {db_path}")
+    # Read-only: the benchmark only reads, and must never create or alter the database
+    conn = sqlite3.connect(f"{pathlib.Path(db_path).resolve().as_uri()}?mode=ro", uri=True,
+                           timeout=10.0, check_same_thread=False)
+    row = conn.execute("SELECT username FROM users LIMIT 1").fetchone()
+    username = row[0] if row else ""
+
+    def sample_latency(stop: threading.Event, out: list):
+        while not stop.is_set():
+            start = time.perf_counter()
+            conn.execute("SELECT password_hash, salt FROM users WHERE username = ?", (username,)).fetchone()
+            out.append((time.perf_counter() - start) * 1000)
+
+    def measure(during_backup: bool):
+        samples, stop = [], threading.Event()
+        worker = threading.Thread(target=sample_latency, args=(stop, samples))
+        worker.start()
+        result = None
+        if during_backup:
+            result = create_backup(db_path, dest_dir)
+        else:
+            time.sleep(duration)
+        stop.set()
+        worker.join()
+        return samples, result
+
+    idle, _ = measure(False)
+    busy, result = measure(True)
+    conn.close()
+
+    def pct(samples, p):
+        samples = sorted(samples)
+        return samples[min(len(samples) - 1, int(len(samples) * p))] if samples else 0.0
+
+    return {
+        "backup_seconds": result.seconds,
+        "backup_mb_per_s": result.size_bytes / (1024 * 1024) / result.seconds if result.seconds else 0.0,
+        "compression_ratio": result.size_bytes / result.compressed_bytes if result.compressed_bytes else 0.0,
+        "login_p50_ms_idle": statistics.median(idle) if idle else 0.0,
+        "login_p99_ms_idle": pct(idle, 0.99),
+        "login_p50_ms_backup": statistics.median(busy) if busy else 0.0,
+        "login_p99_ms_backup": pct(busy, 0.99),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Online backup and restore for users.db")
+    parser.add_argument("--db", default=DB_NAME, help="Path to the SQLite database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    create = sub.add_parser("create", help="Take a compressed snapshot")
+    create.add_argument("--dest", default=BACKUP_DIR)
+    create.add_argument("--pages", type=int, default=STEP_PAGES, help="Pages copied per step")
+    create.add_argument("--sleep", type=float, default=STEP_SLEEP, help="Seconds to pause between steps")
+
+    verify = sub.add_parser("verify", help="Check a snapshot's checksum")
+    verify.add_argument("path")
+
+    restore = sub.add_parser("restore", help="Restore a snapshot over the database")
+    restore.add_argument("path")
+
+    sub.add_parser("benchmark", help="Backup throughput vs concurrent login latency")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "create":
+            result = create_backup(args.db, args.dest, args.pages, args.sleep)
+            print(f"✓ Backup written to {result.path}")
+            print(f"  {result.pages} pages, {result.size_bytes / 1024:.1f} KiB -> "
+                  f"{result.compressed_bytes / 1024:.1f} KiB in {result.seconds:.2f}s")
+            print(f"  SHA-256: {result.checksum}")
+        elif args.command == "verify":
+            print(f"✓ Checksum OK: {verify_backup(args.path)}")
+        elif args.command == "restore":
+            restore_backup(args.path, args.db)
+            print(f"✓ Restored {args.path} into {args.db}")
+        else:
+            for key, value in benchmark(args.db).items():
+                print(f"  {key:<22} {value:>10.3f}")
+    except (BackupError, sqlite3.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
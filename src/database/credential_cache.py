@@ -0,0 +1,81 @@
+# src/database/credential_cache.py
+"""
+In-process read-through cache of (password_hash, salt) rows keyed by username.
+Bounded LRU with a TTL; writers call invalidate() so a changed password is
+never served stale from this process.
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+import threading
+import time
+
+from src.utils.metrics import registry
+
+CACHE_ENABLED = True
+CACHE_MAX_ENTRIES = 10000
+CACHE_TTL_SECONDS = 300.0
+
+
+class CredentialCache:
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS,
+                 enabled: bool = CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, username: str) -> Optional[Tuple[str, str]]:
+        """Cached (password_hash, salt), or None on a miss or expired entry"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[username]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, username: str, row: Tuple[str, str]):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[username] = (time.monotonic() + self.ttl, row)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, username: str):
+        with self._lock:
+            self._entries.pop(username, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+# Shared instance used by login_user / register_user
+credential_cache = CredentialCache()
+registry.gauge("credential_cache_entries", "Cached credential rows",
+               lambda: credential_cache.stats()["entries"])
+registry.gauge("credential_cache_hit_rate", "Credential cache hit rate",
+               lambda: credential_cache.stats()["hit_rate"])
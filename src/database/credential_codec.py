@@ -0,0 +1,123 @@
+# src/database/credential_codec.py
+"""
+Storage format for users.password_hash and users.salt.
+
+Legacy rows hold hex TEXT (64 + 32 chars). New rows hold a BLOB of one
+version byte followed by the raw bytes (33 + 17 bytes), roughly halving the
+row size. Readers accept both so the migration can run online.
+
+Usage:
+    python -m src.database.credential_codec [--batch-size 500] [--vacuum]
+"""
+from typing import Union
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from src.database.db_handler import DB_NAME
+
+FORMAT_V1 = b"\x01"
+MIGRATION_BATCH_SIZE = 500
+MIGRATION_SLEEP = 0.01
+
+
+def encode_credential(hex_value: str) -> bytes:
+    """Hex string from hash_password -> versioned BLOB for storage"""
+    return FORMAT_V1 + bytes.fromhex(hex_value)
+
+
+def decode_credential(value: Union[str, bytes]) -> str:
+    """Stored value (legacy hex TEXT or versioned BLOB) -> hex string"""
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    if value[:1] == FORMAT_V1:
+        return value[1:].hex()
+    raise ValueError(f"Unknown credential format: {value[:1]!r}")
+
+
+def _file_stats(conn):
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    rows = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+    try:
+        table_pages = conn.execute("SELECT COUNT(*) FROM dbstat WHERE name = 'users'").fetchone()[0]
+    except sqlite3.OperationalError:
+        table_pages = None
+    return {"bytes": page_size * page_count, "table_pages": table_pages, "rows": rows}
+
+
+def migrate_credentials(db_path: str = DB_NAME, batch_size: int = MIGRATION_BATCH_SIZE,
+                        sleep: float = MIGRATION_SLEEP, vacuum: bool = False):
+    """
+    Rewrite legacy hex rows as BLOBs in small transactions, walking rowid so
+    each batch is an index range and writers are only blocked briefly.
+    Returns before/after size stats.
+    """
+    conn = sqlite3.connect(db_path, timeout=10.0, isolation_level=None)
+    try:
+        before = _file_stats(conn)
+        migrated = 0
+        last_rowid = 0
+        while True:
+            rows = conn.execute(
+                "SELECT rowid, password_hash, salt FROM users "
+                "WHERE rowid > ? AND typeof(password_hash) = 'text' ORDER BY rowid LIMIT ?",
+                (last_rowid, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "UPDATE users SET password_hash = ?, salt = ? WHERE rowid = ? AND typeof(password_hash) = 'text'",
+                    [(encode_credential(h), encode_credential(s), rowid) for rowid, h, s in rows]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            migrated += len(rows)
+            last_rowid = rows[-1][0]
+            time.sleep(sleep)
+
+        if vacuum:
+            # Shrunken rows leave slack inside pages; only VACUUM repacks them
+            conn.execute("VACUUM")
+        after = _file_stats(conn)
+        return {"migrated": migrated, "before": before, "after": after}
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert hex password hashes/salts to compact BLOBs")
+    parser.add_argument("--db", default=DB_NAME)
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE)
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to reclaim the freed space")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file not found: {args.db}")
+        return 1
+
+    result = migrate_credentials(args.db, args.batch_size, vacuum=args.vacuum)
+    before, after = result["before"], result["after"]
+    print(f"✓ Migrated {result['migrated']} rows")
+    print(f"  File size:   {before['bytes'] / 1024:.1f} KiB -> {after['bytes'] / 1024:.1f} KiB")
+    if before["table_pages"] and after["table_pages"]:
+        # Same cache_size now holds proportionally more rows, so more lookups hit the page cache
+        density_before = before["rows"] / before["table_pages"]
+        density_after = after["rows"] / after["table_pages"]
+        print(f"  users pages: {before['table_pages']} -> {after['table_pages']}")
+        print(f"  Rows/page:   {density_before:.1f} -> {density_after:.1f} "
+              f"({density_after / density_before:.2f}x rows per cached page)")
+    if not args.vacuum:
+        print("  Run with --vacuum to repack pages and shrink the file")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
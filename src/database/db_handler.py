@@ -1,19 +1,105 @@
+import logging
 import sqlite3
 import os
 from contextlib import contextmanager
 
+logger = logging.getLogger(__name__)
+
 # Use absolute path for database
 DB_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_NAME = os.path.join(DB_DIR, "users.db")
 
+# Sharded mode: users are spread over SHARD_COUNT files in SHARD_DIR (0 or 1 = single users.db)
+SHARD_COUNT = int(os.environ.get("SECURE_UTILITIES_SHARDS", "0"))
+SHARD_DIR = os.environ.get("SECURE_UTILITIES_SHARD_DIR", os.path.join(DB_DIR, "shards"))
+
+# User store backend: "sqlite", "sharded" or "memory" (see src/database/repository.py)
+USER_BACKEND = os.environ.get(
+    "SECURE_UTILITIES_USER_STORE", "sharded" if SHARD_COUNT > 1 else "sqlite"
+)
+USER_BACKENDS = ("sqlite", "sharded", "memory")
+
+def check_user_store_config():
+    """
+    Raise ValueError with a readable message for an unusable user store
+    configuration. Called at startup, since login_user treats any storage
+    error as a failed login and would otherwise hide it.
+    """
+    if USER_BACKEND not in USER_BACKENDS:
+        raise ValueError(
+            f"SECURE_UTILITIES_USER_STORE={USER_BACKEND!r} is not one of: {', '.join(USER_BACKENDS)}"
+        )
+    if USER_BACKEND == "sharded" and SHARD_COUNT < 2:
+        raise ValueError(
+            f"SECURE_UTILITIES_USER_STORE=sharded needs SECURE_UTILITIES_SHARDS set to 2 or more "
+            f"(got {SHARD_COUNT})"
+        )
+
+def configure_connection(conn):
+    """Apply the standard pragmas to a new connection"""
+    # Only takes effect on a new, empty database, so it must run before WAL is enabled
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")  # Enable Write-Ahead Logging
+    conn.execute("PRAGMA busy_timeout=5000")  # 5 second busy timeout
+    return conn
+
+def create_users_table(cur):
+    """Create the users table and its index if missing"""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash BLOB NOT NULL,
+            salt BLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Create index for faster username lookups
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_username 
+        ON users(username)
+    """)
+
+def create_search_index(cur):
+    """
+    FTS5 trigram index over users.username, kept in sync by triggers.
+    Returns False if this SQLite build lacks FTS5/trigram (3.34+ needed).
+    """
+    try:
+        cur.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS users_fts
+            USING fts5(username, content='users', content_rowid='id', tokenize='trigram')
+        """)
+    except sqlite3.OperationalError:
+        return False
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN
+            INSERT INTO users_fts(rowid, username) VALUES (new.id, new.username);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN
+            INSERT INTO users_fts(users_fts, rowid, username) VALUES ('delete', old.id, old.username);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS users_fts_update AFTER UPDATE OF username ON users BEGIN
+            INSERT INTO users_fts(users_fts, rowid, username) VALUES ('delete', old.id, old.username);
+            INSERT INTO users_fts(rowid, username) VALUES (new.id, new.username);
+        END
+    """)
+    # Databases created before the index existed: populate it once
+    indexed = cur.execute("SELECT COUNT(*) FROM users_fts_docsize").fetchone()[0]
+    if indexed == 0 and cur.execute("SELECT EXISTS(SELECT 1 FROM users)").fetchone()[0]:
+        cur.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+    return True
+
 @contextmanager
 def get_db_connection():
     """Context manager for safe database connections"""
     conn = None
     try:
-        conn = sqlite3.connect(DB_NAME, timeout=10.0)
-        conn.execute("PRAGMA journal_mode=WAL")  # Enable Write-Ahead Logging
-        conn.execute("PRAGMA busy_timeout=5000")  # 5 second busy timeout
+        conn = configure_connection(sqlite3.connect(DB_NAME, timeout=10.0))
         yield conn
         conn.commit()
     except Exception as e:
@@ -26,25 +112,15 @@ def get_db_connection():
 
 def init_db():
     """Initialize the database with users table"""
+    check_user_store_config()
     try:
         with get_db_connection() as conn:
             cur = conn.cursor()
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    salt TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            # Create index for faster username lookups
-            cur.execute("""
-                CREATE INDEX IF NOT EXISTS idx_username 
-                ON users(username)
-            """)
+            create_users_table(cur)
+            if not create_search_index(cur):
+                logger.warning("FTS5 trigram tokenizer unavailable; substring search will scan the table")
             conn.commit()
-            print(f"Database initialized at: {DB_NAME}")
-    except Exception as e:
-        print(f"Database initialization error: {e}")
+            logger.info("Database initialized at %s", DB_NAME)
+    except Exception:
+        logger.exception("Database initialization failed")
         raise
\ No newline at end of file
@@ -0,0 +1,195 @@
+# src/database/maintenance.py
+"""
+Background maintenance for users.db, run off the UI thread:
+- WAL checkpoints: PASSIVE on a timer, TRUNCATE once the -wal file passes a size limit
+- incremental vacuum when the freelist grows (databases with auto_vacuum=INCREMENTAL)
+- periodic PRAGMA optimize, and a full ANALYZE less often
+Each operation's pause time is recorded in stats() and, when metrics are
+enabled, in the db_maintenance_<operation>_seconds histograms.
+
+auto_vacuum only takes effect on a new file. Databases created before it
+was set need a one-time VACUUM, best run while the app is closed:
+
+    python -m src.database.maintenance --convert [--db users.db]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from src.database.db_handler import DB_NAME
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# How often the worker wakes up to check thresholds (seconds)
+CHECK_INTERVAL = 30.0
+# PASSIVE checkpoint at least this often (seconds)
+CHECKPOINT_INTERVAL = 300.0
+# TRUNCATE checkpoint once the WAL file exceeds this many bytes
+WAL_TRUNCATE_BYTES = 4 * 1024 * 1024
+# Run incremental_vacuum when this many pages are free, reclaiming up to VACUUM_PAGES per pass
+FREELIST_THRESHOLD = 256
+VACUUM_PAGES = 512
+OPTIMIZE_INTERVAL = 3600.0
+ANALYZE_INTERVAL = 24 * 3600.0
+# PRAGMA auto_vacuum values
+AUTO_VACUUM_NONE = 0
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+class DatabaseMaintenance:
+    """Daemon thread that keeps the WAL and freelist in check"""
+
+    def __init__(self, db_path: str = DB_NAME, check_interval: float = CHECK_INTERVAL):
+        self.db_path = db_path
+        self.check_interval = check_interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_run = {}
+        self._reported_auto_vacuum = False
+        self.metrics = {}
+
+    # ---- lifecycle ----
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-maintenance", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        # Stagger the first pass so it doesn't compete with app startup
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.run_once()
+            except sqlite3.Error as e:
+                # Busy or locked - try again next tick
+                logger.debug("Maintenance pass skipped: %s", e)
+
+    # ---- operations ----
+    def run_once(self, now: float = None):
+        """Check every threshold once and run whatever is due"""
+        now = time.monotonic() if now is None else now
+        conn = sqlite3.connect(self.db_path, timeout=1.0, isolation_level=None)
+        try:
+            conn.execute("PRAGMA busy_timeout=1000")
+
+            if self.wal_size() > WAL_TRUNCATE_BYTES:
+                self._timed(conn, "checkpoint_truncate", "PRAGMA wal_checkpoint(TRUNCATE)", now)
+            elif self._due("checkpoint_passive", CHECKPOINT_INTERVAL, now):
+                self._timed(conn, "checkpoint_passive", "PRAGMA wal_checkpoint(PASSIVE)", now)
+
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if auto_vacuum == AUTO_VACUUM_INCREMENTAL and freelist >= FREELIST_THRESHOLD:
+                self._timed(conn, "incremental_vacuum", f"PRAGMA incremental_vacuum({VACUUM_PAGES})", now)
+            elif auto_vacuum != AUTO_VACUUM_INCREMENTAL and not self._reported_auto_vacuum:
+                self._reported_auto_vacuum = True
+                logger.warning("%s predates auto_vacuum=INCREMENTAL, so free pages are never reclaimed; "
+                               "run `python -m src.database.maintenance --convert` while the app is closed",
+                               self.db_path)
+
+            if self._due("analyze", ANALYZE_INTERVAL, now):
+                self._timed(conn, "analyze", "ANALYZE", now)
+            elif self._due("optimize", OPTIMIZE_INTERVAL, now):
+                self._timed(conn, "optimize", "PRAGMA optimize", now)
+        finally:
+            conn.close()
+
+    def wal_size(self) -> int:
+        try:
+            return os.path.getsize(self.db_path + "-wal")
+        except OSError:
+            return 0
+
+    def _due(self, name: str, interval: float, now: float) -> bool:
+        last = self._last_run.get(name)
+        return last is None or now - last >= interval
+
+    def _timed(self, conn, name: str, sql: str, now: float):
+        start = time.perf_counter()
+        if sql.startswith("PRAGMA incremental_vacuum"):
+            # Frees one page per step; execute() would only step it once
+            conn.executescript(sql)
+        else:
+            conn.execute(sql).fetchall()
+        pause = time.perf_counter() - start
+        self._last_run[name] = now
+        if registry.enabled:
+            registry.histogram(f"db_maintenance_{name}_seconds", f"Pause time of {name}").observe(pause)
+        with self._lock:
+            m = self.metrics.setdefault(name, {"runs": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+            m["runs"] += 1
+            m["total_ms"] += pause * 1000
+            m["max_ms"] = max(m["max_ms"], pause * 1000)
+            m["last_ms"] = pause * 1000
+
+    def stats(self):
+        """Copy of per-operation pause metrics (runs, total/max/last ms)"""
+        with self._lock:
+            return {name: dict(m) for name, m in self.metrics.items()}
+
+
+def start_maintenance(db_path: str = DB_NAME) -> DatabaseMaintenance:
+    """Create and start the maintenance worker"""
+    return DatabaseMaintenance(db_path).start()
+
+
+def convert_auto_vacuum(db_path: str = DB_NAME):
+    """
+    Switch an existing database to auto_vacuum=INCREMENTAL. The pragma alone
+    only records the wish; the VACUUM that applies it rewrites the whole file
+    and holds the write lock throughout. Returns (before, after) modes.
+    """
+    conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None)
+    try:
+        before = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if before != AUTO_VACUUM_INCREMENTAL:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+        return before, conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="users.db maintenance")
+    parser.add_argument("--db", default=DB_NAME)
+    parser.add_argument("--convert", action="store_true",
+                        help="One-time VACUUM to enable auto_vacuum=INCREMENTAL (run with the app closed)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file not found: {args.db}")
+        return 1
+    if not args.convert:
+        parser.print_help()
+        return 2
+
+    size_before = os.path.getsize(args.db)
+    before, after = convert_auto_vacuum(args.db)
+    if before == after:
+        print(f"✓ {args.db} already uses auto_vacuum=INCREMENTAL")
+        return 0
+    if after != AUTO_VACUUM_INCREMENTAL:
+        print(f"❌ auto_vacuum is still {after} after VACUUM")
+        return 1
+    print(f"✓ auto_vacuum {before} -> {after}")
+    print(f"  File size: {size_before / 1024:.1f} KiB -> {os.path.getsize(args.db) / 1024:.1f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# src/database/repository.py
+"""
+Storage backends for user accounts behind one interface, so auth code never
+touches SQL or file paths directly.
+
+Backends:
+- "sqlite":  the single users.db file (default)
+- "sharded": ShardedUserStore over several SQLite files
+- "memory":  plain dict, for tests and benchmarks without disk I/O
+
+The backend comes from USER_BACKEND in db_handler (SECURE_UTILITIES_USER_STORE
+environment variable); set_user_repository() swaps it at runtime.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+import sqlite3
+import threading
+
+from src.database.db_handler import DB_NAME, USER_BACKEND, configure_connection
+from src.utils.metrics import timed
+
+
+class UserExistsError(Exception):
+    """Raised by create_user when the username is already taken."""
+
+
+class UserRepository(ABC):
+    @abstractmethod
+    def get_credentials(self, username: str) -> Optional[Tuple]:
+        """Stored (password_hash, salt) for username, or None"""
+
+    @abstractmethod
+    def create_user(self, username: str, password_hash, salt):
+        """Insert a user; raises UserExistsError if the username is taken"""
+
+    @abstractmethod
+    def bulk_create(self, rows: Iterable[Tuple]) -> int:
+        """
+        Insert (username, password_hash, salt) rows; returns the number inserted.
+        All-or-nothing: if any username already exists or repeats within rows,
+        UserExistsError is raised and none of the rows are inserted.
+        """
+
+    @abstractmethod
+    def list_users(self, limit: int = 100, after: str = "") -> List[str]:
+        """Usernames in ascending order, starting after the given username"""
+
+
+class SQLiteUserRepository(UserRepository):
+    """users table in a single SQLite file, one reused connection per thread"""
+
+    def __init__(self, db_path: str = DB_NAME):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = configure_connection(sqlite3.connect(self.db_path, timeout=10.0))
+            self._local.conn = conn
+        return conn
+
+    @timed("user_lookup")
+    def get_credentials(self, username: str) -> Optional[Tuple]:
+        return self._conn().execute(
+            "SELECT password_hash, salt FROM users WHERE username = ?", (username,)
+        ).fetchone()
+
+    @timed("user_create")
+    def create_user(self, username: str, password_hash, salt):
+        conn = self._conn()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)",
+                    (username, password_hash, salt)
+                )
+        except sqlite3.IntegrityError:
+            raise UserExistsError(username)
+
+    @timed("user_bulk_create")
+    def bulk_create(self, rows: Iterable[Tuple]) -> int:
+        conn = self._conn()
+        try:
+            with conn:
+                cur = conn.executemany(
+                    "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)", rows
+                )
+                return cur.rowcount
+        except sqlite3.IntegrityError as e:
+            raise UserExistsError(str(e))
+
+    def list_users(self, limit: int = 100, after: str = "") -> List[str]:
+        return [row[0] for row in self._conn().execute(
+            "SELECT username FROM users WHERE username > ? ORDER BY username LIMIT ?", (after, limit)
+        )]
+
+
+class InMemoryUserRepository(UserRepository):
+    """Dict-backed store; nothing touches disk"""
+
+    def __init__(self):
+        self._users: Dict[str, Tuple] = {}
+        self._lock = threading.Lock()
+
+    def get_credentials(self, username: str) -> Optional[Tuple]:
+        return self._users.get(username)
+
+    def create_user(self, username: str, password_hash, salt):
+        with self._lock:
+            if username in self._users:
+                raise UserExistsError(username)
+            self._users[username] = (password_hash, salt)
+
+    def bulk_create(self, rows: Iterable[Tuple]) -> int:
+        rows = list(rows)
+        with self._lock:
+            names = [row[0] for row in rows]
+            if len(set(names)) != len(names) or any(name in self._users for name in names):
+                raise UserExistsError("duplicate username in batch")
+            for username, password_hash, salt in rows:
+                self._users[username] = (password_hash, salt)
+        return len(rows)
+
+    def list_users(self, limit: int = 100, after: str = "") -> List[str]:
+        return sorted(name for name in self._users if name > after)[:limit]
+
+
+def create_repository(backend: str = USER_BACKEND) -> UserRepository:
+    """Build the repository for a backend name"""
+    if backend == "sqlite":
+        return SQLiteUserRepository()
+    if backend == "sharded":
+        from src.database.sharding import get_sharded_store
+        return get_sharded_store()
+    if backend == "memory":
+        return InMemoryUserRepository()
+    raise ValueError(f"Unknown user store backend: {backend}")
+
+
+_repository = None
+
+def get_user_repository() -> UserRepository:
+    """Shared repository for the configured backend"""
+    global _repository
+    if _repository is None:
+        _repository = create_repository()
+    return _repository
+
+
+def set_user_repository(repository: UserRepository):
+    """Swap the shared repository (tests, benchmarks, alternative stores)"""
+    global _repository
+    _repository = repository
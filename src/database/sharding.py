@@ -0,0 +1,358 @@
+# src/database/sharding.py
+"""
+Optional horizontally sharded user store.
+
+Each username is routed to one of N SQLite files by a stable hash, so a given
+username can only ever live in one shard and that shard's UNIQUE constraint
+guarantees uniqueness across the whole store. Every shard has its own
+connection pool and its own writer lock, so registrations on different
+shards proceed in parallel.
+
+Scope: only the UserRepository paths (login, registration, availability
+checks, bulk import) use the shards. Sessions stay in users.db, which
+is fine because they are not per-user data. Admin search
+(src/database/user_search.py), background maintenance, backups,
+diagnostics and the credential migration still operate on users.db
+alone, so they don't see or maintain sharded users.
+
+Usage:
+    python -m src.database.sharding import --shards 4            # users.db -> shards
+    python -m src.database.sharding reshard --from 4 --to 8 --to-dir new_shards
+    python -m src.database.sharding benchmark --rows 4000
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import hashlib
+import heapq
+import os
+import queue
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from src.database.db_handler import (
+    DB_NAME, SHARD_COUNT, SHARD_DIR, configure_connection, create_users_table
+)
+from src.database.repository import UserExistsError, UserRepository
+from src.utils.metrics import timed
+
+POOL_SIZE = 4
+RESHARD_BATCH_SIZE = 1000
+
+
+def shard_for(username: str, num_shards: int) -> int:
+    """Stable shard index for a username (independent of PYTHONHASHSEED)"""
+    digest = hashlib.blake2b(username.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % num_shards
+
+
+def shard_path(shard_dir: str, index: int) -> str:
+    return os.path.join(shard_dir, f"users_shard_{index:03d}.db")
+
+
+def existing_shards(shard_dir: str) -> List[int]:
+    """Sorted indexes of the shard files present in shard_dir"""
+    try:
+        names = os.listdir(shard_dir)
+    except FileNotFoundError:
+        return []
+    matches = (re.fullmatch(r"users_shard_(\d{3})\.db", name) for name in names)
+    return sorted(int(m.group(1)) for m in matches if m)
+
+
+class ConnectionPool:
+    """Fixed-size pool of connections to one SQLite file"""
+
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+            self._pool.put(configure_connection(conn))
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """A connection whose transaction is committed on exit (rolled back on error)"""
+        with self.checkout() as conn:
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def checkout(self) -> Iterator[sqlite3.Connection]:
+        """A connection for the caller to commit or roll back itself"""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class ShardedUserStore(UserRepository):
+    """User rows spread over num_shards SQLite files in shard_dir"""
+
+    def __init__(self, shard_dir: str = SHARD_DIR, num_shards: int = SHARD_COUNT, pool_size: int = POOL_SIZE):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.shard_dir = shard_dir
+        self.num_shards = num_shards
+        os.makedirs(shard_dir, exist_ok=True)
+        self.pools = [ConnectionPool(shard_path(shard_dir, i), pool_size) for i in range(num_shards)]
+        # One bulk_create at a time, so two batches never wait on each other's open shard transactions
+        self._bulk_lock = threading.Lock()
+        for pool in self.pools:
+            with pool.connection() as conn:
+                create_users_table(conn.cursor())
+
+    def _pool(self, username: str) -> ConnectionPool:
+        return self.pools[shard_for(username, self.num_shards)]
+
+    @timed("user_lookup")
+    def get_credentials(self, username: str) -> Optional[Tuple]:
+        with self._pool(username).connection() as conn:
+            return conn.execute(
+                "SELECT password_hash, salt FROM users WHERE username = ?", (username,)
+            ).fetchone()
+
+    @timed("user_create")
+    def create_user(self, username: str, password_hash, salt):
+        """Insert one user; raises UserExistsError if the username exists"""
+        try:
+            with self._pool(username).connection() as conn:
+                conn.execute(
+                    "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)",
+                    (username, password_hash, salt)
+                )
+        except sqlite3.IntegrityError:
+            raise UserExistsError(username)
+
+    @timed("user_bulk_create")
+    def bulk_create(self, rows: Iterable[Tuple]) -> int:
+        """
+        Insert (username, password_hash, salt) rows, grouped by shard and
+        written to all shards in parallel. Every shard's transaction stays open
+        until all of them have succeeded, then all are committed; if any shard
+        fails (e.g. a duplicate username), all are rolled back, so the batch is
+        all-or-nothing like the other backends. Only a failure during the final
+        commits themselves (disk full, I/O error) can leave it partly applied.
+        """
+        groups: Dict[int, List[Tuple]] = {}
+        for row in rows:
+            groups.setdefault(shard_for(row[0], self.num_shards), []).append(row)
+        if not groups:
+            return 0
+
+        def write(index, conn):
+            conn.executemany(
+                "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)",
+                groups[index]
+            )
+            return len(groups[index])
+
+        with self._bulk_lock, ExitStack() as stack:
+            conns = {index: stack.enter_context(self.pools[index].checkout()) for index in groups}
+            with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                futures = [executor.submit(write, index, conn) for index, conn in conns.items()]
+                errors = [f.exception() for f in futures]
+            failed = next((e for e in errors if e is not None), None)
+            if failed is not None:
+                for conn in conns.values():
+                    conn.rollback()
+                if isinstance(failed, sqlite3.IntegrityError):
+                    raise UserExistsError(str(failed))
+                raise failed
+            for conn in conns.values():
+                conn.commit()
+            return sum(f.result() for f in futures)
+
+    def _scan_shard(self, index: int, batch_size: int) -> Iterator[Tuple]:
+        """All rows of one shard in username order, paged by keyset"""
+        last = ""
+        while True:
+            with self.pools[index].connection() as conn:
+                rows = conn.execute(
+                    "SELECT username, password_hash, salt, created_at FROM users "
+                    "WHERE username > ? ORDER BY username LIMIT ?",
+                    (last, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][0]
+
+    def iter_users(self, batch_size: int = RESHARD_BATCH_SIZE) -> Iterator[Tuple]:
+        """Scatter-gather: merge every shard's sorted stream into one username-ordered stream"""
+        return heapq.merge(*(self._scan_shard(i, batch_size) for i in range(self.num_shards)))
+
+    def list_users(self, limit: int = 100, after: str = "") -> List[str]:
+        """Usernames in order, queried from all shards in parallel and merged"""
+        def query(pool):
+            with pool.connection() as conn:
+                return [r[0] for r in conn.execute(
+                    "SELECT username FROM users WHERE username > ? ORDER BY username LIMIT ?",
+                    (after, limit)
+                )]
+
+        with ThreadPoolExecutor(max_workers=self.num_shards) as executor:
+            parts = list(executor.map(query, self.pools))
+        return list(heapq.merge(*parts))[:limit]
+
+    def count(self) -> int:
+        total = 0
+        for pool in self.pools:
+            with pool.connection() as conn:
+                total += conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        return total
+
+    def close(self):
+        for pool in self.pools:
+            pool.close()
+
+
+_store = None
+
+def get_sharded_store() -> ShardedUserStore:
+    """Shared store for the configured SHARD_DIR / SHARD_COUNT"""
+    global _store
+    if _store is None:
+        _store = ShardedUserStore(SHARD_DIR, SHARD_COUNT)
+    return _store
+
+
+def _copy_rows(rows: Iterable[Tuple], target: ShardedUserStore, batch_size: int) -> int:
+    copied, batch = 0, []
+    for username, password_hash, salt, *_ in rows:
+        batch.append((username, password_hash, salt))
+        if len(batch) >= batch_size:
+            copied += target.bulk_create(batch)
+            batch = []
+    if batch:
+        copied += target.bulk_create(batch)
+    return copied
+
+
+def import_single_db(db_path: str, target: ShardedUserStore, batch_size: int = RESHARD_BATCH_SIZE) -> int:
+    """Copy every user from a single users.db into a sharded store"""
+    conn = sqlite3.connect(db_path, timeout=10.0)
+
+    def rows():
+        last = 0
+        while True:
+            page = conn.execute(
+                "SELECT rowid, username, password_hash, salt FROM users WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last, batch_size)
+            ).fetchall()
+            if not page:
+                return
+            last = page[-1][0]
+            for row in page:
+                yield row[1:]
+
+    try:
+        return _copy_rows(rows(), target, batch_size)
+    finally:
+        conn.close()
+
+
+def reshard(source: ShardedUserStore, target: ShardedUserStore, batch_size: int = RESHARD_BATCH_SIZE) -> int:
+    """Stream every user from source into target (with a different shard count)"""
+    return _copy_rows(source.iter_users(batch_size), target, batch_size)
+
+
+def benchmark(rows: int = 4000, shard_counts=(1, 2, 4, 8), writers: int = 16) -> Dict[int, float]:
+    """
+    Registration throughput (rows/s) per shard count, with concurrent writers
+    each committing one user at a time - the pattern of a signup burst, where
+    a single file serializes every commit behind one write lock.
+    """
+    data = [(f"user{i:07d}", b"\x01" + bytes(32), b"\x01" + bytes(16)) for i in range(rows)]
+    results = {}
+    for n in shard_counts:
+        tmp = tempfile.mkdtemp(prefix="shard-bench-")
+        store = ShardedUserStore(tmp, n, pool_size=max(POOL_SIZE, writers))
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=writers) as executor:
+                list(executor.map(lambda row: store.create_user(*row), data))
+            results[n] = rows / (time.perf_counter() - start)
+        finally:
+            store.close()
+            shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+def _shard_count(text):
+    value = int(text)
+    if value < 2:
+        # The app refuses SECURE_UTILITIES_SHARDS below 2 (check_user_store_config)
+        raise argparse.ArgumentTypeError("must be at least 2")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded user store tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="Copy users.db into a sharded store")
+    imp.add_argument("--db", default=DB_NAME)
+    imp.add_argument("--dir", default=SHARD_DIR)
+    imp.add_argument("--shards", type=_shard_count, required=True)
+
+    rs = sub.add_parser("reshard", help="Copy a sharded store into a new shard count")
+    rs.add_argument("--from-dir", default=SHARD_DIR)
+    rs.add_argument("--from", dest="from_shards", type=_shard_count, required=True)
+    rs.add_argument("--to-dir", required=True)
+    rs.add_argument("--to", dest="to_shards", type=_shard_count, required=True)
+
+    bench = sub.add_parser("benchmark", help="Concurrent create_user throughput per shard count")
+    bench.add_argument("--rows", type=int, default=4000)
+
+    args = parser.parse_args(argv)
+
+    def check_layout(shard_dir, count, option, must_exist):
+        # Opening a store with the wrong count would create missing shards and misroute every lookup
+        found = existing_shards(shard_dir)
+        if (found or must_exist) and found != list(range(count)):
+            parser.error(f"{shard_dir} holds {len(found)} shard file(s), not the {count} given by {option}")
+
+    if args.command == "import":
+        check_layout(args.dir, args.shards, "--shards", must_exist=False)
+        target = ShardedUserStore(args.dir, args.shards)
+        print(f"✓ Imported {import_single_db(args.db, target)} users into {args.shards} shards in {args.dir}")
+        target.close()
+    elif args.command == "reshard":
+        if os.path.abspath(args.from_dir) == os.path.abspath(args.to_dir):
+            parser.error("--to-dir must differ from --from-dir")
+        check_layout(args.from_dir, args.from_shards, "--from", must_exist=True)
+        check_layout(args.to_dir, args.to_shards, "--to", must_exist=False)
+        source = ShardedUserStore(args.from_dir, args.from_shards)
+        target = ShardedUserStore(args.to_dir, args.to_shards)
+        copied = reshard(source, target)
+        print(f"✓ Copied {copied} users from {args.from_shards} to {args.to_shards} shards")
+        print(f"  Set SECURE_UTILITIES_SHARD_DIR={args.to_dir} and SECURE_UTILITIES_SHARDS={args.to_shards} to switch")
+        source.close()
+        target.close()
+    else:
+        for n, rate in benchmark(args.rows).items():
+            print(f"  {n} shard(s): {rate:>12,.0f} rows/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# src/database/user_search.py
+"""
+Listing and searching users for admin tooling over large users tables.
+
+Every query is a bounded page plus a cursor for the next one, so cost stays
+flat however deep you page:
+- list_page:     keyset pagination on id (no OFFSET scan)
+- prefix_search: username range [prefix, next prefix) served by the username index
+- search:        substring match through the users_fts trigram table
+                 (see create_search_index in db_handler); falls back to a
+                 LIKE scan for terms under 3 characters or without FTS5
+
+Usage:
+    python -m src.database.user_search list [--after 0] [--limit 50]
+    python -m src.database.user_search prefix adm
+    python -m src.database.user_search search smith
+    python -m src.database.user_search benchmark --rows 1000000
+"""
+from typing import Callable, Iterator, List, Tuple
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from src.database.db_handler import (
+    DB_NAME, USER_BACKEND, configure_connection, create_search_index, create_users_table
+)
+
+PAGE_SIZE = 50
+# Trigram index can only answer terms of at least 3 characters
+MIN_FTS_TERM = 3
+
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT EXISTS(SELECT 1 FROM sqlite_master WHERE name = 'users_fts')"
+    ).fetchone()[0] == 1
+
+
+def list_page(conn: sqlite3.Connection, after_id: int = 0, limit: int = PAGE_SIZE) -> List[Tuple]:
+    """(id, username, created_at) rows with id > after_id; pass the last id to get the next page"""
+    return conn.execute(
+        "SELECT id, username, created_at FROM users WHERE id > ? ORDER BY id LIMIT ?",
+        (after_id, limit)
+    ).fetchall()
+
+
+def iter_users(conn: sqlite3.Connection, batch_size: int = 1000) -> Iterator[Tuple]:
+    """Every user in id order, one page in memory at a time"""
+    last = 0
+    while True:
+        rows = list_page(conn, last, batch_size)
+        if not rows:
+            return
+        yield from rows
+        last = rows[-1][0]
+
+
+def _prefix_upper(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def prefix_search(conn: sqlite3.Connection, prefix: str, after: str = "",
+                  limit: int = PAGE_SIZE) -> List[Tuple]:
+    """
+    (id, username) rows whose username starts with prefix (case-sensitive), in
+    username order; pass the last username as after for the next page.
+    A range on username lets SQLite walk the index, which LIKE 'x%' won't do
+    under the default case-insensitive LIKE.
+    """
+    if not prefix:
+        return conn.execute(
+            "SELECT id, username FROM users WHERE username > ? ORDER BY username LIMIT ?",
+            (after, limit)
+        ).fetchall()
+    # One lower bound keeps it a single index range
+    lower = "username > ?" if after >= prefix else "username >= ?"
+    return conn.execute(
+        f"SELECT id, username FROM users WHERE {lower} AND username < ? ORDER BY username LIMIT ?",
+        (max(after, prefix), _prefix_upper(prefix), limit)
+    ).fetchall()
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search(conn: sqlite3.Connection, term: str, after_id: int = 0,
+           limit: int = PAGE_SIZE) -> List[Tuple]:
+    """(id, username) rows containing term (case-insensitive), in id order; pass the last id for the next page"""
+    if len(term) >= MIN_FTS_TERM and has_search_index(conn):
+        phrase = '"' + term.replace('"', '""') + '"'
+        return conn.execute(
+            "SELECT rowid, username FROM users_fts WHERE users_fts MATCH ? AND rowid > ? "
+            "ORDER BY rowid LIMIT ?",
+            (phrase, after_id, limit)
+        ).fetchall()
+    return conn.execute(
+        "SELECT id, username FROM users WHERE username LIKE ? ESCAPE '\\' AND id > ? ORDER BY id LIMIT ?",
+        (_like_pattern(term), after_id, limit)
+    ).fetchall()
+
+
+def _time_query(fn: Callable, repeat: int) -> float:
+    """Average milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def benchmark(rows: int = 1_000_000, repeat: int = 20):
+    """
+    Build a throwaway users table of the given size and compare each query
+    against the naive version it replaces. Returns {name: (indexed_ms, naive_ms)}.
+    """
+    tmp = tempfile.mkdtemp(prefix="user-search-bench-")
+    conn = configure_connection(sqlite3.connect(os.path.join(tmp, "users.db")))
+    try:
+        cur = conn.cursor()
+        create_users_table(cur)
+        create_search_index(cur)
+        credential = (b"\x01" + bytes(32), b"\x01" + bytes(16))
+        batch = 50_000
+        for start in range(0, rows, batch):
+            with conn:
+                conn.executemany(
+                    "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)",
+                    ((f"user{i:07d}_{i * 7919 % 100003:05d}", *credential)
+                     for i in range(start, min(start + batch, rows)))
+                )
+        conn.execute("ANALYZE")
+
+        deep = rows * 9 // 10
+        prefix = f"user{deep // 1000:04d}"
+        term = f"{deep * 7919 % 100003:05d}"
+        results = {
+            "page at 90%": (
+                _time_query(lambda: list_page(conn, deep), repeat),
+                _time_query(lambda: conn.execute(
+                    "SELECT id, username, created_at FROM users ORDER BY id LIMIT ? OFFSET ?",
+                    (PAGE_SIZE, deep)).fetchall(), repeat)
+            ),
+            "prefix": (
+                _time_query(lambda: prefix_search(conn, prefix), repeat),
+                _time_query(lambda: conn.execute(
+                    "SELECT id, username FROM users WHERE username LIKE ? ORDER BY username LIMIT ?",
+                    (prefix + "%", PAGE_SIZE)).fetchall(), repeat)
+            ),
+            "substring": (
+                _time_query(lambda: search(conn, term), repeat),
+                _time_query(lambda: conn.execute(
+                    "SELECT id, username FROM users WHERE username LIKE ? ORDER BY id LIMIT ?",
+                    (f"%{term}%", PAGE_SIZE)).fetchall(), repeat)
+            ),
+        }
+        return results
+    finally:
+        conn.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _print_rows(rows: List[Tuple]):
+    for row in rows:
+        print("  " + " | ".join(str(value) for value in row))
+    print(f"  ({len(rows)} rows)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List and search users")
+    parser.add_argument("--db", default=DB_NAME)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    lst = sub.add_parser("list", help="Page through users by id")
+    lst.add_argument("--after", type=int, default=0, help="Last id of the previous page")
+    lst.add_argument("--limit", type=int, default=PAGE_SIZE)
+
+    pre = sub.add_parser("prefix", help="Usernames starting with a prefix")
+    pre.add_argument("prefix")
+    pre.add_argument("--after", default="", help="Last username of the previous page")
+    pre.add_argument("--limit", type=int, default=PAGE_SIZE)
+
+    srch = sub.add_parser("search", help="Usernames containing a substring")
+    srch.add_argument("term")
+    srch.add_argument("--after", type=int, default=0, help="Last id of the previous page")
+    srch.add_argument("--limit", type=int, default=PAGE_SIZE)
+
+    bench = sub.add_parser("benchmark", help="Indexed vs naive queries on a generated table")
+    bench.add_argument("--rows", type=int, default=1_000_000)
+
+    args = parser.parse_args(argv)
+    if args.command == "benchmark":
+        print(f"Building {args.rows:,} users...")
+        print(f"  {'query':<12} {'indexed':>10} {'naive':>10}")
+        for name, (indexed, naive) in benchmark(args.rows).items():
+            print(f"  {name:<12} {indexed:>8.3f}ms {naive:>8.3f}ms  ({naive / indexed:.0f}x)")
+        return 0
+
+    if not os.path.exists(args.db):
+        print(f"❌ Database file not found: {args.db}")
+        return 1
+    if USER_BACKEND == "sharded" and args.db == DB_NAME:
+        print("⚠️  Sharded user store is enabled; this only searches users.db, not the shard files",
+              file=sys.stderr)
+    conn = sqlite3.connect(args.db, timeout=10.0)
+    try:
+        if args.command == "list":
+            _print_rows(list_page(conn, args.after, args.limit))
+        elif args.command == "prefix":
+            _print_rows(prefix_search(conn, args.prefix, args.after, args.limit))
+        else:
+            _print_rows(search(conn, args.term, args.after, args.limit))
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
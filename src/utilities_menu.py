@@ -2,14 +2,24 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from src.utils.util_shortener import shorten_url
 from src.utils.sms_messaging import send_message
-from src.utils.fake_data_generator import generate_fake_users
+from src.utils.fake_data_generator import iter_fake_users
 from src.widgets.calculator import Calculator
+from src.widgets.window_manager import WindowManager
+from src.database.audit import audit_log, LOGOUT
+from src.auth.session import session_store
+from src.utils.profiling import profiled, profiler
+
+# Fake data rows are generated and inserted in chunks so the UI stays responsive
+FAKE_DATA_MAX_ROWS = 100000
+FAKE_DATA_CHUNK_SIZE = 200
+FAKE_DATA_CHUNK_DELAY_MS = 1
 
 
 class AccessibleDashboard:
-    def __init__(self, parent_root: tk.Tk, username: str):
+    def __init__(self, parent_root: tk.Tk, username: str, session_token: str = None):
         self.root = parent_root
         self.username = username
+        self.session_token = session_token
 
         # Premium dark theme with refined colors
         self.colors = {
@@ -33,6 +43,9 @@ class AccessibleDashboard:
             'shadow': '#000000'          # shadow
         }
 
+        # Tool windows (calculator) are reused instead of recreated
+        self.windows = WindowManager(self.root)
+
         self.setup_dashboard()
         self.apply_smooth_transitions()
 
@@ -340,6 +353,16 @@ class AccessibleDashboard:
             icon="🚀"
         ).pack()
 
+        # Window status (reuse count and widget footprint)
+        self.calc_status = tk.Label(
+            content,
+            text="",
+            font=("Segoe UI", 8),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_dim']
+        )
+        self.calc_status.pack(pady=(15, 0))
+
     # ==== MESSAGING ====
     def setup_messaging(self):
         tab = tk.Frame(self.tab_control, bg=self.colors['bg_main'])
@@ -456,25 +479,71 @@ class AccessibleDashboard:
             icon="⚡"
         ).pack(side="left")
 
-        # Results area
+        # Status label (progress while rows stream in)
+        self.fake_status = tk.Label(
+            content,
+            text="Click 'Generate' to create fake user data...",
+            font=("Segoe UI", 9),
+            bg=self.colors['bg_card'],
+            fg=self.colors['text_dim']
+        )
+        self.fake_status.pack(anchor="w", pady=(0, 10))
+
+        # Results area - a Treeview only lays out the visible rows, so large
+        # result sets stay responsive where a Text widget would stall
         results_container = tk.Frame(content, bg=self.colors['primary'])
         results_container.pack(fill="both", expand=True, pady=(0, 0))
 
-        self.fake_results = scrolledtext.ScrolledText(
-            results_container,
-            font=("Consolas", 9),
-            bg=self.colors['primary'],
-            fg=self.colors['text_primary'],
-            insertbackground=self.colors['accent'],
-            height=12,
+        style = ttk.Style()
+        style.configure(
+            'Modern.Treeview',
+            background=self.colors['primary'],
+            fieldbackground=self.colors['primary'],
+            foreground=self.colors['text_primary'],
+            rowheight=24,
+            borderwidth=0,
+            font=("Consolas", 9)
+        )
+        style.configure(
+            'Modern.Treeview.Heading',
+            background=self.colors['bg_card'],
+            foreground=self.colors['accent'],
             relief="flat",
-            wrap=tk.WORD,
-            padx=15,
-            pady=15
+            font=("Segoe UI", 9, "bold")
+        )
+        style.map(
+            'Modern.Treeview',
+            background=[('selected', self.colors['bg_hover'])],
+            foreground=[('selected', self.colors['accent'])]
+        )
+
+        columns = ("num", "name", "email", "phone", "address")
+        self.fake_results = ttk.Treeview(
+            results_container,
+            columns=columns,
+            show="headings",
+            style='Modern.Treeview',
+            height=12
         )
+        headings = {
+            "num": ("#", 60),
+            "name": ("Name", 180),
+            "email": ("Email", 220),
+            "phone": ("Phone", 160),
+            "address": ("Address", 360)
+        }
+        for col in columns:
+            text, width = headings[col]
+            self.fake_results.heading(col, text=text, anchor="w")
+            self.fake_results.column(col, width=width, anchor="w", stretch=(col == "address"))
+
+        scrollbar = ttk.Scrollbar(results_container, orient="vertical", command=self.fake_results.yview)
+        self.fake_results.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
         self.fake_results.pack(fill="both", expand=True)
-        self.fake_results.insert("1.0", "Click 'Generate' to create fake user data...")
-        self.fake_results.config(state="disabled", fg=self.colors['text_dim'])
+
+        # Pending after() job for the chunked insertion, if any
+        self.fake_job = None
 
     def create_footer(self):
         """Create modern footer with logout"""
@@ -491,7 +560,53 @@ class AccessibleDashboard:
         )
         logout_btn.pack(side="right")
 
+        # Profiling toggle: captures cProfile/tracemalloc reports per action
+        self.profile_btn = self.create_modern_button(
+            footer,
+            "",
+            self.toggle_profiling,
+            style='primary'
+        )
+        self.profile_btn.pack(side="left")
+        self.profile_status = tk.Label(
+            footer,
+            text="",
+            font=("Segoe UI", 9),
+            bg=self.colors['bg_main'],
+            fg=self.colors['text_dim']
+        )
+        self.profile_status.pack(side="left", padx=(10, 0))
+        self.update_profile_button()
+
     # ==== LOGIC METHODS ====
+    def session_valid(self):
+        """Check the session token (a dict lookup); log out if it has expired"""
+        if self.session_token is None or session_store.validate(self.session_token) == self.username:
+            return True
+        messagebox.showwarning("Session Expired", "Your session has expired. Please log in again.")
+        audit_log.record(LOGOUT, self.username, "session expired")
+        self.complete_logout()
+        return False
+
+    def update_profile_button(self):
+        """Reflect the profiler state on the footer toggle"""
+        if profiler.active:
+            self.profile_btn.config(text="⏹  Stop Profiling")
+            self.profile_status.config(text="Capturing profiles...")
+        else:
+            self.profile_btn.config(text="⏺  Start Profiling")
+
+    def toggle_profiling(self):
+        """Start or stop a profiling capture"""
+        if profiler.active:
+            report_dir = profiler.stop()
+            self.profile_status.config(
+                text=f"Reports written to {report_dir}" if report_dir else "No actions captured"
+            )
+        else:
+            profiler.start()
+        self.update_profile_button()
+
     def update_char_count(self, event=None):
         """Update character count with color coding"""
         count = len(self.msg_text.get("1.0", "end-1c"))
@@ -509,8 +624,11 @@ class AccessibleDashboard:
             fg=color
         )
 
+    @profiled("do_shorten")
     def do_shorten(self):
         """Handle URL shortening with smooth feedback"""
+        if not self.session_valid():
+            return
         url = self.url_entry.get().strip()
         
         # Clear placeholder
@@ -539,11 +657,20 @@ class AccessibleDashboard:
             )
 
     def open_calculator(self):
-        """Open calculator window"""
-        Calculator(self.root)
+        """Open the calculator window, reusing it if it already exists"""
+        if not self.session_valid():
+            return
+        self.windows.open("calculator", lambda: Calculator(self.root))
+        info = self.windows.stats()["calculator"]
+        self.calc_status.config(
+            text=f"Calculator opened {info['opens']}x • {info['widgets']} widgets"
+        )
 
+    @profiled("do_send_message")
     def do_send_message(self):
         """Handle message sending"""
+        if not self.session_valid():
+            return
         recipient = self.msg_recipient.get().strip()
         message = self.msg_text.get("1.0", "end-1c").strip()
 
@@ -578,47 +705,72 @@ class AccessibleDashboard:
                 fg=self.colors['danger']
             )
 
+    @profiled("do_generate_fake")
     def do_generate_fake(self):
         """Generate fake user data"""
+        if not self.session_valid():
+            return
         try:
             count = int(self.fake_count.get())
             
-            if count < 1 or count > 100:
-                messagebox.showwarning("Invalid Input", "Please enter a number between 1 and 100")
+            if count < 1 or count > FAKE_DATA_MAX_ROWS:
+                messagebox.showwarning("Invalid Input", f"Please enter a number between 1 and {FAKE_DATA_MAX_ROWS:,}")
                 return
 
-            users = generate_fake_users(count)
-
-            self.fake_results.config(state="normal", fg=self.colors['text_primary'])
-            self.fake_results.delete("1.0", "end")
-
-            for i, user in enumerate(users, 1):
-                self.fake_results.insert("end",
-                    f"{'═' * 70}\n"
-                    f"  USER #{i:02d}\n"
-                    f"{'═' * 70}\n"
-                    f"  Name:     {user['name']}\n"
-                    f"  Email:    {user['email']}\n"
-                    f"  Phone:    {user['phone']}\n"
-                    f"  Address:  {user['address']}\n\n"
-                )
+            # Cancel a run that is still streaming before starting a new one
+            self.cancel_fake_job()
+            self.fake_results.delete(*self.fake_results.get_children())
 
-            self.fake_results.config(state="disabled")
+            users = enumerate(iter_fake_users(count), 1)
+            self.fake_status.config(text=f"Generating 0 / {count:,} records...", fg=self.colors['text_secondary'])
+            self.fake_job = self.root.after_idle(lambda: self.insert_fake_chunk(users, count))
 
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid number")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
+    @profiled("do_generate_fake")
+    def insert_fake_chunk(self, users, total):
+        """Generate and insert the next chunk of rows, then yield to the event loop"""
+        self.fake_job = None
+        try:
+            inserted = 0
+            for i, user in users:
+                self.fake_results.insert("", "end", values=(
+                    i, user['name'], user['email'], user['phone'], user['address']
+                ))
+                inserted = i
+                if i % FAKE_DATA_CHUNK_SIZE == 0:
+                    break
+            else:
+                self.fake_status.config(text=f"✅  Generated {total:,} records", fg=self.colors['success'])
+                return
+
+            self.fake_status.config(text=f"Generating {inserted:,} / {total:,} records...")
+            self.fake_job = self.root.after(FAKE_DATA_CHUNK_DELAY_MS, lambda: self.insert_fake_chunk(users, total))
+        except Exception as e:
+            self.fake_status.config(text=f"❌  Error: {str(e)}", fg=self.colors['danger'])
+
+    def cancel_fake_job(self):
+        """Stop any in-progress chunked insertion"""
+        if self.fake_job is not None:
+            self.root.after_cancel(self.fake_job)
+            self.fake_job = None
+
     def do_logout(self):
         """Handle logout with confirmation"""
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
+            audit_log.record(LOGOUT, self.username)
             # Fade out animation
             self.fade_out()
             self.root.after(300, self.complete_logout)
 
     def complete_logout(self):
         """Complete the logout process"""
+        session_store.revoke(self.session_token)
+        self.cancel_fake_job()
+        self.windows.destroy_all()
         self.dashboard.destroy()
         self.root.state("normal")
         self.root.geometry("420x380")
@@ -657,6 +809,6 @@ class AccessibleDashboard:
             self.root.after(15, self.fade_out)
 
 
-def build_dashboard(parent_root: tk.Tk, username: str):
+def build_dashboard(parent_root: tk.Tk, username: str, session_token: str = None):
     """Create and return the dashboard instance"""
-    return AccessibleDashboard(parent_root, username)
\ No newline at end of file
+    return AccessibleDashboard(parent_root, username, session_token)
\ No newline at end of file
@@ -0,0 +1,83 @@
+# src/utils/bloom.py
+"""
+Bloom filter: a compact set that can answer "definitely not present" or
+"probably present". False positives happen at roughly the configured rate;
+false negatives never do, so a miss can skip the real lookup entirely.
+
+A filter can be saved to a file and opened with MappedBloomFilter, which
+mmaps the bit array instead of reading it, so a filter of millions of
+entries costs no Python heap and opens instantly.
+"""
+import hashlib
+import math
+import mmap
+import struct
+
+# File layout: magic, num_bits, num_hashes, count, then the bit array
+FILE_MAGIC = b"BLM1"
+_HEADER = struct.Struct("<4sQIQ")
+
+
+def optimal_size(capacity: int, error_rate: float):
+    """(number of bits, number of hash functions) for capacity items at error_rate"""
+    capacity = max(capacity, 1)
+    bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def _positions(item: str, num_bits: int, num_hashes: int):
+    # Double hashing: k positions from one 128-bit digest
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.num_bits, self.num_hashes = optimal_size(capacity, error_rate)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def add(self, item: str):
+        for pos in _positions(item, self.num_bits, self.num_hashes):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7))
+                   for pos in _positions(item, self.num_bits, self.num_hashes))
+
+    def __len__(self):
+        return self.count
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(FILE_MAGIC, self.num_bits, self.num_hashes, self.count))
+            f.write(self.bits)
+
+
+class MappedBloomFilter:
+    """Read-only BloomFilter backed by a memory-mapped file from BloomFilter.save"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.num_bits, self.num_hashes, self.count = _HEADER.unpack_from(self._map)
+        if magic != FILE_MAGIC:
+            self._map.close()
+            raise ValueError(f"Not a Bloom filter file: {path}")
+        self._offset = _HEADER.size
+
+    def __contains__(self, item: str) -> bool:
+        bits, offset = self._map, self._offset
+        return all(bits[offset + (pos >> 3)] & (1 << (pos & 7))
+                   for pos in _positions(item, self.num_bits, self.num_hashes))
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,169 @@
+# src/utils/breached_passwords.py
+"""
+Screening of new passwords against a local list of common/breached passwords.
+
+The list (millions of lines) is compiled once into a Bloom filter file; at
+runtime the file is memory-mapped, so a check is a handful of byte reads
+(microseconds) and the list never lives in a Python set. A false positive
+(~0.1% by default) only means an uncommon password is refused and the user
+picks another. If no filter file exists, screening is skipped.
+
+Usage:
+    python -m src.utils.breached_passwords build rockyou.txt
+    python -m src.utils.breached_passwords check "hunter2"
+    python -m src.utils.breached_passwords benchmark --entries 1000000
+"""
+from typing import Iterator, Optional
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.utils.bloom import BloomFilter, MappedBloomFilter
+
+BREACHED_FILTER_PATH = os.environ.get(
+    "SECURE_UTILITIES_BREACHED_FILTER",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "breached_passwords.bloom")
+)
+ERROR_RATE = 0.001
+FILTER_RECHECK_SECONDS = 5.0
+
+
+def _read_passwords(path: str) -> Iterator[str]:
+    """One password per line; lists are often not valid UTF-8"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            password = line.rstrip("\r\n")
+            if password:
+                yield password
+
+
+def build_filter(source: str, output: str = BREACHED_FILTER_PATH, error_rate: float = ERROR_RATE) -> int:
+    """Compile a password list into a Bloom filter file; returns the number of entries"""
+    # Two passes so the filter is sized exactly without holding the list in memory
+    count = sum(1 for _ in _read_passwords(source))
+    bloom = BloomFilter(count, error_rate)
+    for password in _read_passwords(source):
+        bloom.add(password)
+    tmp = output + ".tmp"
+    bloom.save(tmp)
+    os.replace(tmp, output)
+    return count
+
+
+_filter = None
+_filter_mtime = None
+_next_stat = 0.0
+
+def _get_filter() -> Optional[MappedBloomFilter]:
+    """Mapped filter, reopened if the file was rebuilt; None if there is none"""
+    global _filter, _filter_mtime, _next_stat
+    now = time.monotonic()
+    if now < _next_stat:
+        return _filter
+    # Stat the file at most once per interval, not on every check
+    _next_stat = now + FILTER_RECHECK_SECONDS
+    try:
+        mtime = os.path.getmtime(BREACHED_FILTER_PATH)
+    except OSError:
+        _filter = None
+        return None
+    if _filter is None or mtime != _filter_mtime:
+        _filter = MappedBloomFilter(BREACHED_FILTER_PATH)
+        _filter_mtime = mtime
+    return _filter
+
+
+def is_breached(password: str) -> bool:
+    """True if password is (probably) on the breached list"""
+    bloom = _get_filter()
+    return bloom is not None and password in bloom
+
+
+def benchmark(entries: int = 1_000_000, lookups: int = 100_000):
+    """Memory and lookup latency: Python set vs memory-mapped Bloom filter"""
+    words = [f"pw{i:08d}!" for i in range(entries)]
+    # Half the probes are on the list, half are not
+    indices = range(0, 2 * entries, max(1, 2 * entries // lookups))
+    probes = [f"pw{i:08d}!" for i in indices]
+    results = {}
+
+    tracemalloc.start()
+    pw_set = set(words)
+    results["set_bytes"] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for probe in probes:
+        probe in pw_set
+    results["set_us"] = (time.perf_counter() - start) / len(probes) * 1e6
+    del pw_set
+
+    fd, path = tempfile.mkstemp(suffix=".bloom")
+    os.close(fd)
+    try:
+        bloom = BloomFilter(entries, ERROR_RATE)
+        for word in words:
+            bloom.add(word)
+        bloom.save(path)
+        del bloom
+        tracemalloc.start()
+        mapped = MappedBloomFilter(path)
+        results["bloom_heap_bytes"] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results["bloom_file_bytes"] = os.path.getsize(path)
+        start = time.perf_counter()
+        hits = sum(1 for probe in probes if probe in mapped)
+        results["bloom_us"] = (time.perf_counter() - start) / len(probes) * 1e6
+        # Any hit beyond the probes that are on the list is a false positive
+        absent = sum(1 for i in indices if i >= entries)
+        present = len(probes) - absent
+        results["false_positive_rate"] = (hits - present) / absent if absent else 0.0
+        mapped.close()
+    finally:
+        os.remove(path)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Breached password screening")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Compile a password list (one per line) into the filter file")
+    build.add_argument("source")
+    build.add_argument("--output", default=BREACHED_FILTER_PATH)
+    build.add_argument("--error-rate", type=float, default=ERROR_RATE)
+
+    check = sub.add_parser("check", help="Check one password against the filter")
+    check.add_argument("password")
+
+    bench = sub.add_parser("benchmark", help="Compare a Python set with the mapped filter")
+    bench.add_argument("--entries", type=int, default=1_000_000)
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        if not os.path.exists(args.source):
+            print(f"❌ File not found: {args.source}")
+            return 1
+        start = time.perf_counter()
+        count = build_filter(args.source, args.output, args.error_rate)
+        print(f"✓ {count:,} passwords -> {args.output} "
+              f"({os.path.getsize(args.output) / 1024 / 1024:.1f} MiB) in {time.perf_counter() - start:.1f}s")
+    elif args.command == "check":
+        if _get_filter() is None:
+            print(f"❌ No filter at {BREACHED_FILTER_PATH}; run the build command first")
+            return 1
+        print("⚠️  Found in breached list" if is_breached(args.password) else "✓ Not in breached list")
+    else:
+        r = benchmark(args.entries)
+        print(f"  {args.entries:,} entries")
+        print(f"  set:    {r['set_bytes'] / 1024 / 1024:8.1f} MiB heap   {r['set_us']:6.2f} µs/lookup")
+        print(f"  bloom:  {r['bloom_heap_bytes'] / 1024:8.1f} KiB heap   {r['bloom_us']:6.2f} µs/lookup"
+              f"   ({r['bloom_file_bytes'] / 1024 / 1024:.1f} MiB mapped file)")
+        print(f"  false positive rate: {r['false_positive_rate']:.4%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Batch evaluation on top of the calculator engine.
+- evaluate_columns: one expression over columns of variable bindings, vectorized
+  with NumPy when it is installed (float mode), pure-Python loop otherwise.
+- evaluate_file: a file of expressions (one per line) evaluated in parallel.
+Both reuse calc_engine's validated, cached compilation - nothing is eval'd raw.
+
+Usage:
+    python -m src.utils.calc_batch expressions.txt [--mode decimal] [--workers 4]
+    python -m src.utils.calc_batch --benchmark [--rows 100000]
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import argparse
+import os
+import sys
+import time
+
+from src.utils.calc_engine import MAX_EXPONENT, CalculatorError, compile_expression, format_result
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# Expressions per task sent to a worker process
+FILE_CHUNK_SIZE = 500
+
+
+def _numpy_pow(base, exponent):
+    if np.max(np.abs(exponent)) > MAX_EXPONENT:
+        raise CalculatorError("Exponent too large")
+    return np.power(np.asarray(base, dtype=float), exponent)
+
+
+def _numpy_namespace() -> Dict[str, object]:
+    """Element-wise replacements for the engine's scalar math functions."""
+    return {
+        "__builtins__": {},
+        "_pow": _numpy_pow,
+        "abs": np.abs,
+        "round": np.round,
+        "min": lambda *args: np.minimum.reduce(args),
+        "max": lambda *args: np.maximum.reduce(args),
+        "sqrt": np.sqrt,
+        "exp": np.exp,
+        "ln": np.log,
+        "log": np.log10,
+        "sin": np.sin,
+        "cos": np.cos,
+        "tan": np.tan,
+        "floor": np.floor,
+        "ceil": np.ceil,
+        "pi": np.pi,
+        "e": np.e,
+    }
+
+
+def _column_length(columns: Mapping[str, Sequence]) -> int:
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise CalculatorError("All columns must have the same length")
+    return lengths.pop() if lengths else 1
+
+
+def _evaluate_numpy(compiled, columns: Mapping[str, Sequence], rows: int) -> List[float]:
+    arrays = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+    try:
+        with np.errstate(divide="raise", invalid="raise", over="raise"):
+            result = eval(compiled.code, _numpy_namespace(), arrays)
+    except CalculatorError:
+        raise
+    except (ArithmeticError, FloatingPointError, ValueError, TypeError) as e:
+        raise CalculatorError(f"Math error: {e}")
+    return np.broadcast_to(result, (rows,)).tolist()
+
+
+def _float_column(name: str, values: Sequence) -> List[float]:
+    try:
+        return [float(value) for value in values]
+    except (TypeError, ValueError) as e:
+        raise CalculatorError(f"Column {name}: {e}")
+
+
+def evaluate_columns(
+    expr: str,
+    columns: Mapping[str, Sequence],
+    mode: str = "float",
+    use_numpy: bool = True
+) -> List:
+    """
+    Evaluate expr once per row of the given columns.
+
+    Args:
+        expr: Calculator expression, e.g. "price * qty * (1 + tax)"
+        columns: Variable name -> sequence of values, all the same length
+        mode: 'float', 'decimal' or 'fraction'
+        use_numpy: Vectorize with NumPy when available (float mode only)
+
+    Returns:
+        List of results, one per row. Falls back to per-row evaluation when
+        the vectorized path fails, so errors name the offending row.
+    """
+    compiled = compile_expression(expr, mode)
+    missing = compiled.variables.difference(columns)
+    if missing:
+        raise CalculatorError(f"Unknown name: {', '.join(sorted(missing))}")
+    columns = {name: columns[name] for name in compiled.variables}
+    rows = _column_length(columns)
+    if mode == "float":
+        # Same coercion as the NumPy path's asarray(dtype=float), so both paths agree
+        columns = {name: _float_column(name, values) for name, values in columns.items()}
+
+    if use_numpy and np is not None and mode == "float":
+        try:
+            return _evaluate_numpy(compiled, columns, rows)
+        except CalculatorError:
+            pass  # re-run row by row to report which row failed
+
+    names = list(columns)
+    results = []
+    for i, values in enumerate(zip(*columns.values()) if names else [()] * rows):
+        try:
+            # evaluate() applies the engine's error mapping and numeric-result check
+            results.append(compiled.evaluate(dict(zip(names, values))))
+        except CalculatorError as e:
+            raise CalculatorError(f"Row {i}: {e}")
+    return results
+
+
+def evaluate_rows(expr: str, rows: Iterable[Mapping[str, object]], mode: str = "float") -> List:
+    """Evaluate expr once per binding dict, e.g. rows from csv.DictReader."""
+    compiled = compile_expression(expr, mode)
+    return [compiled.evaluate(row) for row in rows]
+
+
+def _evaluate_chunk(args: Tuple[List[str], str]) -> List[Tuple[str, str]]:
+    expressions, mode = args
+    out = []
+    for expr in expressions:
+        try:
+            out.append((expr, format_result(compile_expression(expr, mode).evaluate())))
+        except CalculatorError as e:
+            out.append((expr, f"Error: {e}"))
+    return out
+
+
+def _read_expressions(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def evaluate_file(path: str, mode: str = "float", workers: Optional[int] = None) -> List[Tuple[str, str]]:
+    """
+    Evaluate every expression in a file (one per line, '#' comments skipped).
+    Lines are split into chunks and spread over a process pool; each worker
+    keeps its own compile cache. Returns (expression, result-or-error) pairs
+    in file order.
+    """
+    expressions = _read_expressions(path)
+    chunks = [
+        (expressions[i:i + FILE_CHUNK_SIZE], mode)
+        for i in range(0, len(expressions), FILE_CHUNK_SIZE)
+    ]
+    if workers == 1 or len(chunks) <= 1:
+        return [pair for chunk in chunks for pair in _evaluate_chunk(chunk)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [pair for result in pool.map(_evaluate_chunk, chunks) for pair in result]
+
+
+def benchmark(rows: int = 100000, expr: str = "sqrt(x*x + y*y) * 2 + x / (y + 1)") -> Dict[str, float]:
+    """Compare per-row evaluation against evaluate_columns. Returns rows/second."""
+    columns = {"x": [float(i) for i in range(rows)], "y": [float(i % 97) for i in range(rows)]}
+    compiled = compile_expression(expr)
+    results = {}
+
+    start = time.perf_counter()
+    for x, y in zip(columns["x"], columns["y"]):
+        compiled.evaluate({"x": x, "y": y})
+    results["per_row"] = rows / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    evaluate_columns(expr, columns, use_numpy=False)
+    results["columns_python"] = rows / (time.perf_counter() - start)
+
+    if np is not None:
+        start = time.perf_counter()
+        evaluate_columns(expr, columns)
+        results["columns_numpy"] = rows / (time.perf_counter() - start)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate calculator expressions in bulk")
+    parser.add_argument("file", nargs="?", help="File with one expression per line")
+    parser.add_argument("--mode", default="float", choices=["float", "decimal", "fraction"])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--benchmark", action="store_true", help="Benchmark column vs per-row evaluation")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows for --benchmark")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(f"Benchmark ({args.rows:,} rows, numpy {'available' if np is not None else 'not installed'})")
+        for name, rate in benchmark(args.rows).items():
+            print(f"  {name:<16} {rate:>14,.0f} rows/s")
+        return 0
+
+    if not args.file:
+        parser.error("a file is required unless --benchmark is given")
+    if not os.path.exists(args.file):
+        parser.error(f"file not found: {args.file}")
+
+    for expr, result in evaluate_file(args.file, args.mode, args.workers):
+        print(f"{expr} = {result}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,440 @@
+"""
+Safe expression engine for the calculator.
+Expressions are parsed once, checked against a whitelist of AST nodes and
+compiled to a code object that runs without builtins. Compiled forms are cached,
+so repeated evaluations skip parsing entirely. Usable without Tk.
+IncrementalEvaluator and CalculationHistory back the widget's live preview
+and history panel.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+import ast
+import math
+import operator
+import sys
+
+MODES = ("float", "decimal", "fraction")
+
+# Limits on ** so "9**9**9" can't hang the UI
+MAX_EXPONENT = 10000
+MAX_RESULT_BITS = 100000
+# Longest expression accepted, guards against pathological input
+MAX_EXPRESSION_LENGTH = 1000
+COMPILE_CACHE_SIZE = 1024
+HISTORY_SIZE = 50
+
+# Display symbols used by the calculator widget
+_SYMBOLS = {"×": "*", "÷": "/", "−": "-", "^": "**"}
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub)
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, *_BIN_OPS, *_UNARY_OPS,
+)
+
+
+class CalculatorError(ValueError):
+    """Raised for expressions that are invalid, unsafe or fail to evaluate."""
+
+
+def _integral_value(x) -> Optional[int]:
+    """x as an int if it is an int, a whole Fraction or a whole Decimal, else None."""
+    if isinstance(x, bool):
+        return None
+    if isinstance(x, int):
+        return x
+    if isinstance(x, Fraction) and x.denominator == 1:
+        return x.numerator
+    if isinstance(x, Decimal) and x.is_finite() and x == x.to_integral_value():
+        return int(x)
+    return None
+
+
+def _exact_bits(x) -> int:
+    """Bits needed to hold an exact number (ints, Fractions); 0 for floats and Decimals."""
+    if isinstance(x, Fraction):
+        return max(x.numerator.bit_length(), x.denominator.bit_length())
+    if isinstance(x, int):
+        return x.bit_length()
+    return 0
+
+
+def _safe_pow(base, exponent):
+    if abs(exponent) > MAX_EXPONENT:
+        raise CalculatorError("Exponent too large")
+    # Checked before computing: an exact power of a large base never returns
+    # (floats and Decimals are bounded by their own precision and overflow instead)
+    whole_exponent = _integral_value(exponent)
+    if whole_exponent is not None and _exact_bits(base) * abs(whole_exponent) > MAX_RESULT_BITS:
+        raise CalculatorError("Result too large")
+    return operator.pow(base, exponent)
+
+
+def _float_functions() -> Dict[str, Callable]:
+    return {
+        "abs": abs,
+        "round": round,
+        "min": min,
+        "max": max,
+        "sqrt": math.sqrt,
+        "exp": math.exp,
+        "ln": math.log,
+        "log": math.log10,
+        "sin": math.sin,
+        "cos": math.cos,
+        "tan": math.tan,
+        "floor": math.floor,
+        "ceil": math.ceil,
+        "pi": math.pi,
+        "e": math.e,
+    }
+
+
+def _exact(convert: Callable) -> Callable:
+    """Wrap a float-only math function so it returns the mode's number type."""
+    def wrapper(func):
+        return lambda *args: convert(repr(float(func(*(float(a) for a in args)))))
+    return wrapper
+
+
+def _decimal_functions() -> Dict[str, Callable]:
+    funcs = _float_functions()
+    inexact = _exact(Decimal)
+    for name in ("exp", "sin", "cos", "tan"):
+        funcs[name] = inexact(funcs[name])
+    funcs.update({
+        "sqrt": lambda x: Decimal(x).sqrt(),
+        "ln": lambda x: Decimal(x).ln(),
+        "log": lambda x: Decimal(x).log10(),
+        "pi": Decimal(repr(math.pi)),
+        "e": Decimal(repr(math.e)),
+    })
+    return funcs
+
+
+def _fraction_functions() -> Dict[str, Callable]:
+    funcs = _float_functions()
+    inexact = _exact(Fraction)
+    for name in ("sqrt", "exp", "ln", "log", "sin", "cos", "tan"):
+        funcs[name] = inexact(funcs[name])
+    funcs.update({
+        "pi": Fraction(repr(math.pi)),
+        "e": Fraction(repr(math.e)),
+    })
+    return funcs
+
+
+_NUMBER_TYPES = {"float": float, "decimal": Decimal, "fraction": Fraction}
+_NUMERIC_RESULTS = (int, float, Decimal, Fraction)
+_FUNCTIONS = {
+    "float": _float_functions(),
+    "decimal": _decimal_functions(),
+    "fraction": _fraction_functions(),
+}
+
+
+def normalize_expression(expr: str) -> str:
+    """Map calculator display symbols to Python operators."""
+    expr = (expr or "").strip()
+    for symbol, op in _SYMBOLS.items():
+        expr = expr.replace(symbol, op)
+    return expr
+
+
+class _Validator(ast.NodeTransformer):
+    """Reject anything outside the whitelist and hoist numeric literals."""
+
+    def __init__(self, mode: str, functions: Mapping[str, Any]):
+        self.mode = mode
+        self.functions = functions
+        self.constants: Dict[str, Any] = {}
+        self.variables = set()
+
+    def generic_visit(self, node):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise CalculatorError(f"Unsupported syntax: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise CalculatorError(f"Unsupported literal: {value!r}")
+        if self.mode == "float":
+            return node
+        # Exact modes: build the literal from its text so 0.1 stays 0.1
+        name = f"_c{len(self.constants)}"
+        self.constants[name] = _NUMBER_TYPES[self.mode](repr(value))
+        return ast.copy_location(ast.Name(id=name, ctx=ast.Load()), node)
+
+    def visit_Name(self, node):
+        if node.id.startswith("_"):
+            raise CalculatorError(f"Invalid name: {node.id}")
+        if node.id not in self.functions:
+            self.variables.add(node.id)
+        elif callable(self.functions[node.id]):
+            # Callee names are handled by visit_Call, so this is a bare "sqrt"
+            raise CalculatorError(f"{node.id} needs arguments, e.g. {node.id}(x)")
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in self.functions:
+            raise CalculatorError("Only built-in calculator functions can be called")
+        if node.keywords:
+            raise CalculatorError("Keyword arguments are not supported")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+    def visit_BinOp(self, node):
+        node = self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            call = ast.Call(
+                func=ast.Name(id="_pow", ctx=ast.Load()),
+                args=[node.left, node.right],
+                keywords=[],
+            )
+            return ast.copy_location(call, node)
+        return node
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    source: str
+    mode: str
+    variables: FrozenSet[str]
+    code: Any = field(repr=False)
+    namespace: Dict[str, Any] = field(repr=False, compare=False)
+
+    def evaluate(self, variables: Optional[Mapping[str, Any]] = None):
+        """Evaluate with optional variable bindings, returning the raw number."""
+        bindings = variables or {}
+        missing = self.variables.difference(bindings)
+        if missing:
+            raise CalculatorError(f"Unknown name: {', '.join(sorted(missing))}")
+        if self.mode != "float":
+            convert = _NUMBER_TYPES[self.mode]
+            bindings = {k: v if isinstance(v, convert) else convert(str(v)) for k, v in bindings.items()}
+        try:
+            result = eval(self.code, self.namespace, dict(bindings))
+        except CalculatorError:
+            raise
+        except ZeroDivisionError:
+            raise CalculatorError("Division by zero")
+        except InvalidOperation:
+            raise CalculatorError("Math error: invalid operation")
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise CalculatorError(f"Math error: {e}")
+        if isinstance(result, bool) or not isinstance(result, _NUMERIC_RESULTS):
+            raise CalculatorError("Expression does not evaluate to a number")
+        return result
+
+    __call__ = evaluate
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile_expression(expr: str, mode: str = "float") -> CompiledExpression:
+    """Parse, validate and compile an expression. Results are cached."""
+    if mode not in MODES:
+        raise CalculatorError(f"Unknown mode: {mode}")
+    source = normalize_expression(expr)
+    if not source:
+        raise CalculatorError("Empty expression")
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise CalculatorError("Expression too long")
+
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError:
+        raise CalculatorError("Invalid expression")
+
+    functions = _FUNCTIONS[mode]
+    validator = _Validator(mode, functions)
+    tree = ast.fix_missing_locations(validator.visit(tree))
+
+    namespace = {"__builtins__": {}, "_pow": _safe_pow}
+    namespace.update(functions)
+    namespace.update(validator.constants)
+    return CompiledExpression(
+        source=source,
+        mode=mode,
+        variables=frozenset(validator.variables),
+        code=compile(tree, "<calculator>", "eval"),
+        namespace=namespace,
+    )
+
+
+def evaluate(expr: str, mode: str = "float", variables: Optional[Mapping[str, Any]] = None):
+    """Compile (cached) and evaluate an expression in one call."""
+    return compile_expression(expr, mode).evaluate(variables)
+
+
+def _scientific(numerator: int, denominator: int = 1, digits: int = 12) -> str:
+    """numerator/denominator in scientific notation, using integer arithmetic only."""
+    sign = "-" if (numerator < 0) != (denominator < 0) else ""
+    numerator, denominator = abs(numerator), abs(denominator)
+
+    def leading_digits(exponent):
+        shift = digits - 1 - exponent
+        if shift >= 0:
+            return numerator * 10 ** shift // denominator
+        return numerator // (denominator * 10 ** -shift)
+
+    exponent = math.floor(math.log10(numerator) - math.log10(denominator))
+    scaled = leading_digits(exponent)
+    # log10 can be off by one right at a power of ten
+    if scaled >= 10 ** digits:
+        exponent += 1
+    elif scaled < 10 ** (digits - 1):
+        exponent -= 1
+    mantissa = str(leading_digits(exponent))
+    fraction = mantissa[1:].rstrip("0")
+    return f"{sign}{mantissa[0]}{'.' + fraction if fraction else ''}e{'+' if exponent >= 0 else ''}{exponent}"
+
+
+def format_result(value) -> str:
+    """Format a result for display."""
+    if isinstance(value, Fraction):
+        text = _exact_str(value.numerator) if value.denominator == 1 else _exact_str(value)
+        return text if text is not None else _scientific(value.numerator, value.denominator)
+    if isinstance(value, Decimal):
+        value = value.normalize()
+        if value.is_finite() and _fixed_length(value) > _digit_limit():
+            return format(value, ".12g")
+        return format(value, "f")
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e16:
+            return str(int(value))
+        return format(value, ".12g")
+    if isinstance(value, int):
+        text = _exact_str(value)
+        return text if text is not None else _scientific(value)
+    return str(value)
+
+
+def _digit_limit() -> int:
+    """The int-to-str digit limit, also applied to Decimals written out in full."""
+    limit = getattr(sys, "get_int_max_str_digits", lambda: 0)()
+    return limit or 4300
+
+
+def _fixed_length(value: Decimal) -> int:
+    """Digits format(value, "f") writes for a finite Decimal, counting padding zeros."""
+    _, digits, exponent = value.as_tuple()
+    if exponent >= 0:
+        return len(digits) + exponent
+    return max(len(digits), -exponent) + 1
+
+
+def _exact_str(value) -> Optional[str]:
+    """str() of an int or Fraction, or None past the interpreter's int-to-str digit limit."""
+    try:
+        return str(value)
+    except ValueError:
+        return None
+
+
+def complete_expression(expr: str) -> str:
+    """
+    Turn partially typed input into something evaluable for a preview:
+    drop a dangling operator or decimal point and close open parentheses.
+    """
+    source = normalize_expression(expr).rstrip("+-*/%(. ")
+    missing = source.count("(") - source.count(")")
+    return source + ")" * missing if missing > 0 else source
+
+
+def _split_last_term(source: str) -> Tuple[str, str, str]:
+    """
+    Split at the last top-level binary + or -, returning (prefix, op, term).
+    Everything before that operator is unaffected by further typing, and
+    because + and - are left-associative, value(prefix) op value(term) equals
+    the value of the whole expression.
+    """
+    depth = 0
+    for i in range(len(source) - 1, 0, -1):
+        ch = source[i]
+        if ch == ")":
+            depth += 1
+        elif ch == "(":
+            depth -= 1
+        elif ch in "+-" and depth == 0:
+            prev = source[:i].rstrip()
+            if not prev:
+                break
+            last = prev[-1]
+            # 1e-5 is part of a number, not a subtraction
+            if last in "eE" and len(prev) > 1 and prev[-2].isdigit():
+                continue
+            if last.isalnum() or last in "._)":
+                return prev, ch, source[i + 1:]
+    return "", "", source
+
+
+class IncrementalEvaluator:
+    """
+    Evaluate input as it is typed, reusing the value of the unchanged prefix.
+    Typing usually only changes the last additive term, so each keystroke
+    compiles and evaluates just that term instead of the whole expression.
+    """
+
+    def __init__(self, mode: str = "float"):
+        self.mode = mode
+        self._prefix = None
+        self._prefix_value = None
+
+    def evaluate(self, expr: str):
+        """Return the value of (possibly incomplete) input. Raises CalculatorError."""
+        source = complete_expression(expr)
+        if not source:
+            raise CalculatorError("Empty expression")
+        prefix, op, term = _split_last_term(source)
+        if not op:
+            return compile_expression(source, self.mode).evaluate()
+
+        if prefix != self._prefix:
+            self._prefix_value = self.evaluate(prefix)
+            self._prefix = prefix
+        term_value = compile_expression(term, self.mode).evaluate()
+        # Same error mapping CompiledExpression.evaluate applies to the whole expression
+        try:
+            return self._prefix_value + term_value if op == "+" else self._prefix_value - term_value
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise CalculatorError(f"Math error: {e}")
+
+    def preview(self, expr: str) -> Optional[str]:
+        """Formatted value of the input, or None when it can't be evaluated yet."""
+        try:
+            return format_result(self.evaluate(expr))
+        except CalculatorError:
+            return None
+
+
+class CalculationHistory:
+    """Bounded LRU of expression -> formatted result, newest first."""
+
+    def __init__(self, maxsize: int = HISTORY_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, expr: str) -> Optional[str]:
+        result = self._entries.get(expr)
+        if result is not None:
+            self._entries.move_to_end(expr)
+        return result
+
+    def add(self, expr: str, result: str):
+        self._entries[expr] = result
+        self._entries.move_to_end(expr)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def items(self) -> List[Tuple[str, str]]:
+        return list(reversed(self._entries.items()))
+
+    def __len__(self):
+        return len(self._entries)
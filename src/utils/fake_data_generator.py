@@ -1,15 +1,28 @@
 # src/utils/fake_data_generator.py
 from faker import Faker
+from src.utils.metrics import timed
 fake = Faker()
 
-def generate_fake_users(count: int = 5):
+def _fake_user():
+    return {
+        "name": fake.name(),
+        "email": fake.email(),
+        "phone": fake.phone_number(),
+        "address": fake.address().replace("\n", ", ")
+    }
+
+# Users generated per timed batch inside iter_fake_users
+FAKE_CHUNK_SIZE = 200
+
+@timed("fake_users_chunk")
+def _fake_user_chunk(size: int):
+    return [_fake_user() for _ in range(size)]
+
+def iter_fake_users(count: int = 5):
+    """Yield fake users one at a time so callers can render them incrementally."""
     count = max(1, int(count or 5))
-    out = []
-    for _ in range(count):
-        out.append({
-            "name": fake.name(),
-            "email": fake.email(),
-            "phone": fake.phone_number(),
-            "address": fake.address().replace("\n", ", ")
-        })
-    return out
+    for start in range(0, count, FAKE_CHUNK_SIZE):
+        yield from _fake_user_chunk(min(FAKE_CHUNK_SIZE, count - start))
+
+def generate_fake_users(count: int = 5):
+    return list(iter_fake_users(count))
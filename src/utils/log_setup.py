@@ -0,0 +1,82 @@
+# src/utils/log_setup.py
+"""
+Application logging.
+
+Loggers only put records on an in-memory queue (QueueHandler); a
+QueueListener thread formats them and does the console/file I/O, so a slow
+terminal or disk never stalls the Tk thread. Use lazy %-style arguments,
+logger.debug("x=%s", x), so records below the level are never formatted.
+
+Configuration (command-line flags in main.py override these):
+- SECURE_UTILITIES_LOG_LEVEL  DEBUG / INFO / WARNING (default) / ERROR
+- SECURE_UTILITIES_LOG_JSON=1 one JSON object per line
+- SECURE_UTILITIES_LOG_FILE   rotating log file (5 MiB x 3 backups)
+"""
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+import atexit
+import json
+import logging
+import os
+import queue
+
+LOG_LEVEL = os.environ.get("SECURE_UTILITIES_LOG_LEVEL", "WARNING")
+LOG_JSON = os.environ.get("SECURE_UTILITIES_LOG_JSON", "0") == "1"
+LOG_FILE = os.environ.get("SECURE_UTILITIES_LOG_FILE")
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+_listener: Optional[QueueListener] = None
+
+def setup_logging(level: str = LOG_LEVEL, json_format: bool = LOG_JSON,
+                  log_file: Optional[str] = LOG_FILE) -> QueueListener:
+    """Route all logging through a queue to console (and optional file) handlers"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
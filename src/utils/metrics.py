@@ -0,0 +1,238 @@
+# src/utils/metrics.py
+"""
+Lightweight in-process metrics: counters, gauges and latency histograms,
+exportable as Prometheus text.
+
+Disabled by default. When disabled, a @timed function pays one flag check
+and nothing is recorded. Enable with SECURE_UTILITIES_METRICS=1, or
+registry.enabled = True at runtime.
+
+Exports (see start_from_env):
+- SECURE_UTILITIES_METRICS_PORT=9464  ->  http://127.0.0.1:9464/metrics
+- SECURE_UTILITIES_METRICS_FILE=path  ->  text dump written at exit
+
+Histograms use HDR-style log-linear buckets: values are kept to ~3%
+relative precision in a fixed array, so recording is O(1) and percentiles
+need no stored samples.
+"""
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+import atexit
+import os
+import threading
+import time
+
+METRICS_ENABLED = os.environ.get("SECURE_UTILITIES_METRICS", "0") == "1"
+# Sub-buckets per power of two: 2**5 = 32 -> ~3% relative error
+SUB_BUCKET_BITS = 5
+# Histograms record integer microseconds
+HISTOGRAM_UNIT = 1e-6
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Counter:
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Set directly, or computed from a callback at export time"""
+
+    def __init__(self, name: str, help: str = "", function: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.help = help
+        self.function = function
+        self._value = 0.0
+
+    def set(self, value: float):
+        self._value = value
+
+    @property
+    def value(self) -> float:
+        return self.function() if self.function is not None else self._value
+
+
+class Histogram:
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self._sub = 1 << SUB_BUCKET_BITS
+        self._counts: List[int] = [0] * ((64 - SUB_BUCKET_BITS + 1) * self._sub)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def _index(self, units: int) -> int:
+        if units < self._sub:
+            return units
+        shift = units.bit_length() - SUB_BUCKET_BITS - 1
+        # Top SUB_BUCKET_BITS+1 bits of the value pick the bucket
+        return (shift + 1) * self._sub + ((units >> shift) - self._sub)
+
+    def _lower_bound(self, index: int) -> int:
+        if index < self._sub:
+            return index
+        shift = index // self._sub - 1
+        return (index % self._sub + self._sub) << shift
+
+    def observe(self, seconds: float):
+        units = int(seconds / HISTOGRAM_UNIT)
+        index = units if 0 <= units < self._sub else self._index(max(0, units))
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Value at quantile q (0..1), in seconds"""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = max(1, int(q * self.count + 0.5))
+            seen = 0
+            for index, count in enumerate(self._counts):
+                seen += count
+                if seen >= target:
+                    return min(self._lower_bound(index) * HISTOGRAM_UNIT, self.max)
+        return self.max
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _get(self, cls, name: str, help: str, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help, **kwargs)
+        return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "", function: Optional[Callable[[], float]] = None) -> Gauge:
+        return self._get(Gauge, name, help, function=function)
+
+    def histogram(self, name: str, help: str = "") -> Histogram:
+        return self._get(Histogram, name, help)
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        for name, metric in metrics:
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            if isinstance(metric, Counter):
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {metric.value}")
+            elif isinstance(metric, Gauge):
+                try:
+                    value = metric.value
+                except Exception:
+                    continue
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+            else:
+                lines.append(f"# TYPE {name} summary")
+                for q in QUANTILES:
+                    lines.append(f'{name}{{quantile="{q}"}} {metric.percentile(q):.6f}')
+                lines.append(f"{name}_sum {metric.sum:.6f}")
+                lines.append(f"{name}_count {metric.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve /metrics from a daemon thread (localhost only by default)"""
+        # Imported here: http.server is slow to import and most runs never serve
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+# Shared registry for the whole app
+registry = MetricsRegistry()
+
+
+def timed(name: str):
+    """
+    Record call latency in the {name}_seconds histogram and exceptions in
+    {name}_errors_total. A no-op flag check while metrics are disabled.
+    """
+    def decorator(fn):
+        histogram = None
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            nonlocal histogram
+            if not registry.enabled:
+                return fn(*args, **kwargs)
+            if histogram is None:
+                histogram = registry.histogram(f"{name}_seconds", f"{name} latency")
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                registry.counter(f"{name}_errors_total", f"Exceptions raised by {name}").inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def start_from_env():
+    """Start the exporters configured by environment variables (call once from main)"""
+    if not registry.enabled:
+        return
+    port = os.environ.get("SECURE_UTILITIES_METRICS_PORT")
+    if port:
+        registry.serve(int(port))
+    path = os.environ.get("SECURE_UTILITIES_METRICS_FILE")
+    if path:
+        atexit.register(registry.dump, path)
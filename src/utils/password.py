@@ -2,6 +2,16 @@
 import hashlib
 import os
 
+from src.utils.metrics import timed
+
+def normalize_credentials(username: str, password: str) -> tuple[str, str]:
+    """
+    Strip surrounding whitespace from both values. Registration and login
+    must normalize the same way, or an account becomes impossible to log into.
+    """
+    return (username or "").strip(), (password or "").strip()
+
+@timed("hash_password")
 def hash_password(password: str, salt: str | None = None) -> tuple[str, str]:
     """
     Return (hash, salt). If salt is None, a new salt is generated.
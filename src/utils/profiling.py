@@ -0,0 +1,143 @@
+# src/utils/profiling.py
+"""
+Opt-in profiling of startup, login and dashboard actions.
+
+While a capture is running, each named section (see section() and
+@profiled) runs under cProfile and tracemalloc. Calls to the same section
+accumulate, and stop() writes one report set per capture:
+
+    profiles/<timestamp>/<section>.pstats     - open with pstats / snakeviz
+    profiles/<timestamp>/<section>.alloc.txt  - top allocation sites
+    profiles/<timestamp>/summary.txt          - calls, time, memory per section
+
+Start with `python main.py --profile` or SECURE_UTILITIES_PROFILE=1, or
+toggle from the dashboard footer. When no capture is running a section
+costs one attribute check.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Dict, Optional
+import cProfile
+import os
+import threading
+import time
+import tracemalloc
+
+PROFILE_ENABLED = os.environ.get("SECURE_UTILITIES_PROFILE", "0") == "1"
+PROFILE_DIR = os.environ.get(
+    "SECURE_UTILITIES_PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "profiles")
+)
+# Frames kept per allocation traceback
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATIONS = 25
+
+
+class Profiler:
+    def __init__(self, out_dir: str = PROFILE_DIR):
+        self.out_dir = out_dir
+        self.active = False
+        self._local = threading.local()
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._calls: Counter = Counter()
+        self._elapsed: Counter = Counter()
+        self._peak: Dict[str, int] = {}
+        self._allocations: Dict[str, Counter] = {}
+        self._started_tracemalloc = False
+
+    def start(self):
+        if self.active:
+            return
+        self._profiles, self._allocations, self._peak = {}, {}, {}
+        self._calls, self._elapsed = Counter(), Counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        self.active = True
+
+    def stop(self) -> Optional[str]:
+        """End the capture and write its reports; returns the report directory"""
+        if not self.active:
+            return None
+        self.active = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if not self._calls:
+            return None
+        return self._write_reports()
+
+    @contextmanager
+    def section(self, name: str):
+        # cProfile allows one active profiler per thread, so nested sections fold into the outer one
+        if not self.active or getattr(self._local, "busy", False):
+            yield
+            return
+        self._local.busy = True
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._elapsed[name] += time.perf_counter() - start
+            self._calls[name] += 1
+            peak = tracemalloc.get_traced_memory()[1]
+            self._peak[name] = max(self._peak.get(name, 0), peak)
+            allocations = self._allocations.setdefault(name, Counter())
+            for stat in tracemalloc.take_snapshot().compare_to(before, "lineno"):
+                if stat.size_diff > 0:
+                    allocations[str(stat.traceback)] += stat.size_diff
+            self._local.busy = False
+
+    def _report_dir(self) -> str:
+        """Create and return a new report directory, unique even for several runs within one second"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        report_dir = os.path.join(self.out_dir, stamp)
+        counter = 1
+        while True:
+            try:
+                # exist_ok=False: creating the directory is what claims the name
+                os.makedirs(report_dir)
+                return report_dir
+            except FileExistsError:
+                report_dir = os.path.join(self.out_dir, f"{stamp}-{counter}")
+                counter += 1
+
+    def _write_reports(self) -> str:
+        report_dir = self._report_dir()
+        summary = [f"{'section':<24} {'calls':>6} {'total s':>9} {'peak KiB':>10}"]
+        for name in sorted(self._calls):
+            self._profiles[name].dump_stats(os.path.join(report_dir, f"{name}.pstats"))
+            with open(os.path.join(report_dir, f"{name}.alloc.txt"), "w", encoding="utf-8") as f:
+                f.write(f"Top {TOP_ALLOCATIONS} allocation sites in {name} (net bytes over {self._calls[name]} calls)\n")
+                for site, size in self._allocations[name].most_common(TOP_ALLOCATIONS):
+                    f.write(f"{size / 1024:10.1f} KiB  {site}\n")
+            summary.append(f"{name:<24} {self._calls[name]:>6} {self._elapsed[name]:>9.3f} "
+                           f"{self._peak[name] / 1024:>10.1f}")
+        with open(os.path.join(report_dir, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(summary) + "\n")
+        return report_dir
+
+
+# Shared profiler for the app
+profiler = Profiler()
+
+
+def profiled(name: str):
+    """Run the decorated function as a profiler section"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler.active:
+                return fn(*args, **kwargs)
+            with profiler.section(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
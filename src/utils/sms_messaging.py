@@ -6,6 +6,8 @@ from typing import Optional, Dict
 import re
 from dataclasses import dataclass
 
+from src.utils.metrics import timed
+
 @dataclass
 class MessageResult:
     success: bool
@@ -179,6 +181,7 @@ def send_message_simulator(recipient: str, message: str) -> MessageResult:
             provider="simulator"
         )
 
+@timed("send_message")
 def send_message(
     recipient: str,
     message: str,
@@ -1,16 +1,29 @@
 # src/utils/util_shortener.py
 import hashlib
 
+from src.utils.metrics import timed
+
 # Try using pyshorteners if available (faster & real), otherwise fallback to local hash
+try:
+    import pyshorteners
+except ImportError:  # optional dependency; imported once, not on every call
+    pyshorteners = None
+
+def local_short_url(long_url: str) -> str:
+    """Deterministic MD5-based short link; no network"""
+    code = hashlib.md5(long_url.encode()).hexdigest()[:8]
+    return f"https://short.ly/{code}"
+
+@timed("shorten_url")
 def shorten_url(long_url: str) -> str:
     long_url = long_url.strip()
     if not long_url:
         return ""
-    try:
-        import pyshorteners
-        s = pyshorteners.Shortener()
-        return s.tinyurl.short(long_url)
-    except Exception:
-        # fallback: deterministic MD5-based short path
-        code = hashlib.md5(long_url.encode()).hexdigest()[:8]
-        return f"https://short.ly/{code}"
+    if pyshorteners is not None:
+        try:
+            s = pyshorteners.Shortener()
+            return s.tinyurl.short(long_url)
+        except Exception:
+            pass
+    # fallback: deterministic MD5-based short path
+    return local_short_url(long_url)
@@ -1,11 +1,83 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+import argparse
+import csv
+import os
+import re
+import sys
+
+from src.utils.breached_passwords import is_breached
+
+USERNAME_MIN_LENGTH = 3
+USERNAME_MAX_LENGTH = 32
+PASSWORD_MIN_LENGTH = 6
+# Compiled once; fullmatch over the whole name
+USERNAME_PATTERN = re.compile(r"[A-Za-z0-9_.-]+")
+RESERVED_USERNAMES = frozenset({"admin", "administrator", "root", "system", "support", "null"})
+
+# Rows per task sent to a worker process by validate_file
+BATCH_CHUNK_SIZE = 5000
+
+# Error codes, in the order rules are checked
+USERNAME_EMPTY = "username_empty"
+USERNAME_TOO_SHORT = "username_too_short"
+USERNAME_TOO_LONG = "username_too_long"
+USERNAME_INVALID_CHARS = "username_invalid_chars"
+USERNAME_RESERVED = "username_reserved"
+USERNAME_DUPLICATE = "username_duplicate"
+PASSWORD_EMPTY = "password_empty"
+PASSWORD_TOO_SHORT = "password_too_short"
+PASSWORD_BREACHED = "password_breached"
+
+ERROR_MESSAGES = {
+    USERNAME_EMPTY: f"Username must be at least {USERNAME_MIN_LENGTH} characters long.",
+    USERNAME_TOO_SHORT: f"Username must be at least {USERNAME_MIN_LENGTH} characters long.",
+    USERNAME_TOO_LONG: f"Username must be at most {USERNAME_MAX_LENGTH} characters long.",
+    USERNAME_INVALID_CHARS: "Username may only contain letters, digits, '_', '.' and '-'.",
+    USERNAME_RESERVED: "This username is reserved.",
+    USERNAME_DUPLICATE: "Username appears more than once in this batch.",
+    PASSWORD_EMPTY: f"Password must be at least {PASSWORD_MIN_LENGTH} characters long.",
+    PASSWORD_TOO_SHORT: f"Password must be at least {PASSWORD_MIN_LENGTH} characters long.",
+    PASSWORD_BREACHED: "This password appears in a list of breached passwords. Please choose another.",
+}
+
+
+def username_errors(username) -> List[str]:
+    """All error codes for a username (empty list if valid)"""
+    if not username:
+        return [USERNAME_EMPTY]
+    errors = []
+    if len(username) < USERNAME_MIN_LENGTH:
+        errors.append(USERNAME_TOO_SHORT)
+    elif len(username) > USERNAME_MAX_LENGTH:
+        errors.append(USERNAME_TOO_LONG)
+    if USERNAME_PATTERN.fullmatch(username) is None:
+        errors.append(USERNAME_INVALID_CHARS)
+    if username.lower() in RESERVED_USERNAMES:
+        errors.append(USERNAME_RESERVED)
+    return errors
+
+
+def password_errors(password) -> List[str]:
+    """All error codes for a password (empty list if valid)"""
+    if not password:
+        return [PASSWORD_EMPTY]
+    if len(password) < PASSWORD_MIN_LENGTH:
+        return [PASSWORD_TOO_SHORT]
+    if is_breached(password):
+        return [PASSWORD_BREACHED]
+    return []
+
+
 def validate_username(username):
-    if not username or len(username) < 3:
-        return False, "Username must be at least 3 characters long."
+    errors = username_errors(username)
+    if errors:
+        return False, ERROR_MESSAGES[errors[0]]
     return True, ""
 
 def validate_password(password):
-    if not password or len(password) < 6:
-        return False, "Password must be at least 6 characters long."
+    errors = password_errors(password)
+    if errors:
+        return False, ERROR_MESSAGES[errors[0]]
     return True, ""
 
 def validate_registration(username, password):
@@ -24,5 +96,82 @@ def validate_login(username, password):
         return False, "Username cannot be empty."
     if not password:
         return False, "Password cannot be empty."
-    
-    return True, "Validation successful."
\ No newline at end of file
+
+    return True, "Validation successful."
+
+
+def _validate_chunk(rows: Sequence[Tuple[str, str]]) -> List[List[str]]:
+    return [username_errors(username) + password_errors(password) for username, password in rows]
+
+
+def _mark_duplicates(rows: Sequence[Tuple[str, str]], errors: List[List[str]]):
+    """Flag every occurrence after the first of a username within the batch"""
+    seen = set()
+    for (username, _), row_errors in zip(rows, errors):
+        if username in seen:
+            row_errors.append(USERNAME_DUPLICATE)
+        elif username:
+            seen.add(username)
+
+
+def validate_batch(rows: Iterable[Tuple[str, str]], workers: Optional[int] = 1,
+                   chunk_size: int = BATCH_CHUNK_SIZE) -> List[List[str]]:
+    """
+    Validate (username, password) rows. Returns one list of error codes per
+    row, in input order; an empty list means the row is valid. Every rule is
+    checked, not just the first failing one. With workers != 1 the rows are
+    split into chunks and spread over a process pool.
+    """
+    rows = [(username or "", password or "") for username, password in rows]
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        errors = [row_errors for chunk in chunks for row_errors in _validate_chunk(chunk)]
+    else:
+        # Imported here so single-value validation (GUI, CLI) stays cheap to import
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            errors = [row_errors for result in pool.map(_validate_chunk, chunks) for row_errors in result]
+    # Needs the whole batch, so done here rather than per chunk
+    _mark_duplicates(rows, errors)
+    return errors
+
+
+def validate_columns(usernames: Sequence[str], passwords: Sequence[str], **kwargs) -> List[List[str]]:
+    """validate_batch for parallel username/password columns"""
+    if len(usernames) != len(passwords):
+        raise ValueError("usernames and passwords must have the same length")
+    return validate_batch(zip(usernames, passwords), **kwargs)
+
+
+def validate_file(path: str, workers: Optional[int] = None) -> List[Tuple[int, List[str]]]:
+    """
+    Validate a CSV with username,password columns (header row required).
+    Returns (line number, error codes) for invalid rows only.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = [(row.get("username"), row.get("password")) for row in reader]
+    errors = validate_batch(rows, workers)
+    # Line 1 is the header
+    return [(i + 2, row_errors) for i, row_errors in enumerate(errors) if row_errors]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a CSV of usernames and passwords for bulk import")
+    parser.add_argument("file", help="CSV with a username,password header")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.file):
+        print(f"❌ File not found: {args.file}")
+        return 1
+
+    invalid = validate_file(args.file, args.workers)
+    for line, codes in invalid:
+        print(f"Line {line}: {', '.join(codes)}")
+    print(f"{'✓' if not invalid else '❌'} {len(invalid)} invalid row(s)")
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,40 @@
 import tkinter as tk
+from src.utils.calc_engine import (
+    CalculationHistory, CalculatorError, IncrementalEvaluator, evaluate, format_result
+)
+
+# Wait this long after the last keystroke before refreshing the preview
+PREVIEW_DELAY_MS = 120
 
 class Calculator(tk.Toplevel):
-    def __init__(self, master=None):
+    def __init__(self, master=None, mode="float"):
         super().__init__(master)
+        self.mode = mode
         self.title("Calculator")
-        self.geometry("320x420")
+        self.geometry("520x460")
         self.config(bg="#f0f5f9")
 
         self.expression = tk.StringVar()
+        self.preview_text = tk.StringVar()
+        self.preview_job = None
+        self.evaluator = IncrementalEvaluator(mode)
+        self.history = CalculationHistory()
         self.create_widgets()
+        self.expression.trace_add("write", self.schedule_preview)
 
     def create_widgets(self):
         entry = tk.Entry(self, textvariable=self.expression, font=("Arial", 20), bd=10, insertwidth=2, width=17, borderwidth=4, justify='right')
-        entry.grid(row=0, column=0, columnspan=4, pady=20)
+        entry.grid(row=0, column=0, columnspan=4, pady=(20, 0))
+        entry.bind("<Return>", lambda e: self.equal())
+
+        tk.Label(self, textvariable=self.preview_text, font=("Arial", 12), fg="#5a6b7d", bg="#f0f5f9", anchor="e").grid(row=1, column=0, columnspan=4, sticky="ew", padx=10, pady=(0, 10))
 
         buttons = [
-            ('7', 1, 0), ('8', 1, 1), ('9', 1, 2), ('÷', 1, 3),
-            ('4', 2, 0), ('5', 2, 1), ('6', 2, 2), ('×', 2, 3),
-            ('1', 3, 0), ('2', 3, 1), ('3', 3, 2), ('-', 3, 3),
-            ('0', 4, 0), ('.', 4, 1), ('C', 4, 2), ('+', 4, 3),
-            ('=', 5, 0, 4)
+            ('7', 2, 0), ('8', 2, 1), ('9', 2, 2), ('÷', 2, 3),
+            ('4', 3, 0), ('5', 3, 1), ('6', 3, 2), ('×', 3, 3),
+            ('1', 4, 0), ('2', 4, 1), ('3', 4, 2), ('-', 4, 3),
+            ('0', 5, 0), ('.', 5, 1), ('C', 5, 2), ('+', 5, 3),
+            ('=', 6, 0, 4)
         ]
 
         for btn in buttons:
@@ -30,7 +45,13 @@ class Calculator(tk.Toplevel):
             cmd = self.clear if text == "C" else self.equal if text == "=" else lambda x=text: self.press(x)
             tk.Button(self, text=text, padx=20, pady=20, bd=5, fg="black", font=("Arial", 14), bg="#d0e1f9", command=cmd).grid(row=row, column=col, columnspan=colspan, sticky="nsew")
 
-        for i in range(6):
+        # History panel - click an entry to recall it without re-evaluating
+        tk.Label(self, text="History", font=("Arial", 11, "bold"), bg="#f0f5f9").grid(row=0, column=4, sticky="sw", padx=10)
+        self.history_list = tk.Listbox(self, font=("Arial", 10), width=22, activestyle="none", bg="#ffffff", relief="flat")
+        self.history_list.grid(row=1, column=4, rowspan=6, sticky="nsew", padx=10, pady=(0, 10))
+        self.history_list.bind("<<ListboxSelect>>", self.recall_history)
+
+        for i in range(2, 7):
             self.grid_rowconfigure(i, weight=1)
         for i in range(4):
             self.grid_columnconfigure(i, weight=1)
@@ -41,10 +62,56 @@ class Calculator(tk.Toplevel):
     def clear(self):
         self.expression.set("")
 
-    def equal(self):
-        expr = self.expression.get()
+    def schedule_preview(self, *args):
+        """Debounce preview updates while the user is typing"""
+        if self.preview_job is not None:
+            self.after_cancel(self.preview_job)
+        self.preview_job = self.after(PREVIEW_DELAY_MS, self.update_preview)
+
+    def cancel_preview(self):
+        if self.preview_job is not None:
+            self.after_cancel(self.preview_job)
+            self.preview_job = None
+
+    def update_preview(self):
+        self.preview_job = None
         try:
-            result = str(eval(expr.replace("×", "*").replace("÷", "/")))
-            self.expression.set(f"{expr} = {result}")
+            result = self.evaluator.preview(self.expression.get())
         except Exception:
-            self.expression.set("Error")
\ No newline at end of file
+            # A preview is best-effort; never let it break the Tk callback
+            result = None
+        self.preview_text.set(f"= {result}" if result is not None else "")
+
+    def equal(self):
+        expr = self.expression.get().strip()
+        if not expr:
+            return
+        result = self.history.get(expr)
+        if result is None:
+            try:
+                result = format_result(evaluate(expr, self.mode))
+            except CalculatorError as e:
+                self.cancel_preview()
+                self.preview_text.set(f"Error: {e}")
+                return
+        self.history.add(expr, result)
+        self.refresh_history()
+
+        # Keep only the result in the entry so input can continue from it
+        self.expression.set(result)
+        self.cancel_preview()
+        self.preview_text.set(f"{expr} =")
+
+    def refresh_history(self):
+        self.history_list.delete(0, tk.END)
+        for expr, result in self.history.items():
+            self.history_list.insert(tk.END, f"{expr} = {result}")
+
+    def recall_history(self, event=None):
+        selection = self.history_list.curselection()
+        if not selection:
+            return
+        expr, result = self.history.items()[selection[0]]
+        self.expression.set(expr)
+        self.cancel_preview()
+        self.preview_text.set(f"= {result}")
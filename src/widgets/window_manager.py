@@ -0,0 +1,52 @@
+import tkinter as tk
+
+
+def count_widgets(widget) -> int:
+    """Count a widget and all of its descendants"""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+class WindowManager:
+    """
+    Keeps one instance of each tool window. Opening a window that already
+    exists raises it instead of building a new one, and closing it withdraws
+    rather than destroys, so reopening is instant and memory stays flat.
+    """
+
+    def __init__(self, root: tk.Misc):
+        self.root = root
+        self.windows = {}
+        self.opens = {}
+
+    def open(self, key: str, factory):
+        """Show the window registered under key, creating it with factory() on first use"""
+        window = self.windows.get(key)
+        if window is None or not window.winfo_exists():
+            window = factory()
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            self.windows[key] = window
+
+        window.deiconify()
+        window.lift()
+        window.focus_force()
+        self.opens[key] = self.opens.get(key, 0) + 1
+        return window
+
+    def stats(self):
+        """Per-window open count, visibility and widget count"""
+        out = {}
+        for key, window in self.windows.items():
+            alive = window.winfo_exists()
+            out[key] = {
+                "opens": self.opens.get(key, 0),
+                "visible": bool(alive and window.winfo_viewable()),
+                "widgets": count_widgets(window) if alive else 0
+            }
+        return out
+
+    def destroy_all(self):
+        """Really destroy every managed window (e.g. on logout)"""
+        for window in self.windows.values():
+            if window.winfo_exists():
+                window.destroy()
+        self.windows.clear()
@@ -0,0 +1,16 @@
+import pytest
+
+from src.database import repository
+from src.database.audit import audit_log
+from src.database.repository import InMemoryUserRepository
+
+
+@pytest.fixture
+def memory_store(tmp_path, monkeypatch):
+    """In-memory user repository, with the audit log written to a temp file"""
+    store = InMemoryUserRepository()
+    monkeypatch.setattr(repository, "_repository", store)
+    audit_log.stop()
+    monkeypatch.setattr(audit_log, "db_path", str(tmp_path / "audit.db"))
+    yield store
+    audit_log.stop()
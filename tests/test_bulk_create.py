@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+
+from src.database.db_handler import configure_connection, create_users_table
+from src.database.repository import InMemoryUserRepository, SQLiteUserRepository, UserExistsError
+from src.database.sharding import ShardedUserStore
+
+
+def _sqlite(tmp_path):
+    path = str(tmp_path / "users.db")
+    conn = configure_connection(sqlite3.connect(path))
+    create_users_table(conn.cursor())
+    conn.close()
+    return SQLiteUserRepository(path)
+
+
+BACKENDS = {
+    "memory": lambda tmp_path: InMemoryUserRepository(),
+    "sqlite": _sqlite,
+    "sharded": lambda tmp_path: ShardedUserStore(str(tmp_path / "shards"), 4, pool_size=1),
+}
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def store(request, tmp_path):
+    store = BACKENDS[request.param](tmp_path)
+    yield store
+    if isinstance(store, ShardedUserStore):
+        store.close()
+
+
+def _rows(names):
+    return [(name, b"hash", b"salt") for name in names]
+
+
+def test_bulk_create_inserts_all_rows(store):
+    names = [f"user{i:03d}" for i in range(50)]
+    assert store.bulk_create(_rows(names)) == 50
+    assert all(store.get_credentials(name) is not None for name in names)
+
+
+def test_bulk_create_is_all_or_nothing_on_existing_user(store):
+    store.create_user("taken", b"hash", b"salt")
+    # Enough names that every shard gets some rows
+    names = [f"user{i:03d}" for i in range(50)] + ["taken"]
+    with pytest.raises(UserExistsError):
+        store.bulk_create(_rows(names))
+    assert all(store.get_credentials(name) is None for name in names[:-1])
+    assert store.list_users(100) == ["taken"]
+
+
+def test_bulk_create_is_all_or_nothing_on_duplicate_in_batch(store):
+    names = [f"user{i:03d}" for i in range(50)] + ["user007"]
+    with pytest.raises(UserExistsError):
+        store.bulk_create(_rows(names))
+    assert store.list_users(100) == []
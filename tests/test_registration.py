@@ -0,0 +1,25 @@
+import pytest
+
+from src.auth import register
+from src.auth.register import register_user
+
+
+@pytest.fixture
+def messages(monkeypatch):
+    """Capture message boxes instead of opening them"""
+    shown = []
+    for kind in ("showinfo", "showwarning", "showerror"):
+        monkeypatch.setattr(register.messagebox, kind, lambda title, text, kind=kind: shown.append((kind, text)))
+    return shown
+
+
+@pytest.mark.parametrize("username", ["admin", "Root", "has space", "x" * 33])
+def test_register_rejects_invalid_username(memory_store, messages, username):
+    assert register_user(username, "a-good-password-123") is False
+    assert memory_store.get_credentials(username) is None
+    assert messages[-1][0] == "showerror"
+
+
+def test_register_accepts_valid_username(memory_store, messages):
+    assert register_user("alice", "a-good-password-123") is True
+    assert memory_store.get_credentials("alice") is not None